@@ -6,11 +6,15 @@ dict and means the script doesn't need to import the FastAPI app to reuse
 the download logic.
 """
 
+import hashlib
 import os
-import tempfile
-from difflib import SequenceMatcher
+import subprocess
+from dataclasses import dataclass
+from typing import Any
 
-import yt_dlp
+# GridFS's default chunk size; reading the file in the same size means each
+# write fills exactly one chunk document.
+GRIDFS_CHUNK_SIZE = 255 * 1024
 
 YDL_OPTS = {
     "format": "bestaudio/best",
@@ -36,54 +40,113 @@ YDL_OPTS = {
 }
 
 
-def _ratio(a: str, b: str) -> float:
-    return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
+@dataclass(frozen=True)
+class AudioVariant:
+    """A lower-bitrate rendition generated from the downloaded MP3."""
 
+    name: str
+    codec: str
+    bitrate: str
+    extension: str
+    content_type: str
 
-def pick_youtube_match(
-    title: str,
-    artist: str,
-    results: list,
-    threshold: float = 0.7,
-) -> dict | None:
-    """Pick the first ytmusicapi search result whose title AND artist are
-    similar enough to the song we're looking for.
 
-    Both checks use `difflib.SequenceMatcher.ratio()` against the same
-    threshold. Requiring both to match prevents picking the wrong upload
-    when the title is generic (e.g. "Who Knows" by a different artist).
+# Opus at 64-96 kbps sounds close to 192 kbps MP3 at a third to a half of the
+# bytes, which matters most to mobile listeners on slow links.
+AUDIO_VARIANTS = {
+    variant.name: variant
+    for variant in (
+        AudioVariant("opus96", "libopus", "96k", "opus", "audio/ogg"),
+        AudioVariant("opus64", "libopus", "64k", "opus", "audio/ogg"),
+    )
+}
 
-    Returns None if no result clears both bars; the caller should treat that
-    as a failure rather than blindly downloading the top result.
-    """
-    if not title or not artist or not results:
-        return None
-    for result in results:
-        result_title = result.get("title") or ""
-        result_artist = " ".join(a.get("name", "") for a in (result.get("artists") or []))
-        if not result_title or not result_artist:
-            continue
-        if _ratio(title, result_title) >= threshold and _ratio(artist, result_artist) >= threshold:
-            return result
-    return None
-
-
-def download_audio_sync(youtube_url: str) -> bytes:
-    """Synchronous yt-dlp download. Run inside an executor for use from async code.
-
-    Returns the raw MP3 bytes. Raises Exception on any failure.
+
+def download_audio_file(youtube_url: str, dest_dir: str) -> str:
+    """Synchronous yt-dlp download into `dest_dir`. Run inside an executor for
+    use from async code.
+
+    Returns the path of the MP3 on disk; the caller owns `dest_dir` and should
+    stream the file from there (see `upload_audio_file`) rather than reading it
+    into memory. Raises Exception on any failure.
     """
-    try:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            opts = {**YDL_OPTS, "outtmpl": os.path.join(temp_dir, "%(title)s.%(ext)s")}
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                ydl.download([youtube_url])
+    # yt-dlp takes ~100 ms to import; only ingest needs it, so don't make
+    # every process that imports this module (i.e. the API) pay for it
+    import yt_dlp
 
-                files = os.listdir(temp_dir)
-                if not files:
-                    raise Exception("No audio file was downloaded")
+    try:
+        opts = {**YDL_OPTS, "outtmpl": os.path.join(dest_dir, "%(title)s.%(ext)s")}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            ydl.download([youtube_url])
 
-                with open(os.path.join(temp_dir, files[0]), "rb") as f:
-                    return f.read()
+        files = os.listdir(dest_dir)
+        if not files:
+            raise Exception("No audio file was downloaded")
+        return os.path.join(dest_dir, files[0])
     except Exception as e:
         raise Exception(f"Failed to download audio: {str(e)}") from e
+
+
+def transcode_audio_file(src_path: str, dest_dir: str, variant: AudioVariant) -> str:
+    """Synchronous ffmpeg transcode of `src_path` into `dest_dir`. Run inside
+    an executor for use from async code.
+
+    Returns the path of the new file. Raises Exception on any failure.
+    """
+    dest_path = os.path.join(dest_dir, f"{variant.name}.{variant.extension}")
+    command = [
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        src_path,
+        "-vn",
+        "-c:a",
+        variant.codec,
+        "-b:a",
+        variant.bitrate,
+        dest_path,
+    ]
+    try:
+        subprocess.run(command, check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        raise Exception(f"Failed to transcode audio to {variant.name}: {e.stderr.decode(errors='replace').strip()}")
+    except OSError as e:
+        raise Exception(f"Failed to transcode audio to {variant.name}: {str(e)}") from e
+    return dest_path
+
+
+@dataclass(frozen=True)
+class StoredAudio:
+    file_id: Any
+    length: int
+    sha256: str
+
+
+async def upload_audio_file(fs, path: str, filename: str, content_type: str = "audio/mp3") -> StoredAudio:
+    """Stream a file from disk into GridFS one chunk at a time.
+
+    Only one GridFS chunk is ever held in memory, so peak memory per upload
+    stays flat regardless of file size. The SHA-256 computed on the way
+    through is stored on the `fs.files` document and returned with the new
+    file id and length.
+    """
+    grid_in = fs.open_upload_stream(
+        filename, chunk_size_bytes=GRIDFS_CHUNK_SIZE, metadata={"contentType": content_type}
+    )
+    digest = hashlib.sha256()
+    length = 0
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(GRIDFS_CHUNK_SIZE):
+                digest.update(chunk)
+                length += len(chunk)
+                await grid_in.write(chunk)
+        await grid_in.set("sha256", digest.hexdigest())
+    except BaseException:
+        await grid_in.abort()
+        raise
+    await grid_in.close()
+    return StoredAudio(file_id=grid_in._id, length=length, sha256=digest.hexdigest())
@@ -0,0 +1,194 @@
+"""Size-bounded local disk cache in front of GridFS for song audio.
+
+A handful of songs get most of the plays, and every GridFS read pulls 255 KB
+chunks over the network from Mongo. The first full read of a file is teed
+into this cache while it streams to the client; later plays are served from
+local disk with a file response (which the server can send without copying
+through Python). Entries are keyed by GridFS file id and evicted least
+recently used once the total size exceeds `max_bytes`.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".audio"
+_ENTRY_NAME = re.compile(r"^([0-9a-f]{24})\.audio$")
+_PART_NAME = re.compile(r"^[0-9a-f]{24}\.[0-9a-f]{8}\.part$")
+# Partial fills are written continuously, so one untouched for this long was
+# left by a process that died. Younger ones may belong to another worker
+# sharing the directory and are left alone.
+_STALE_PART_SECONDS = 3600
+
+
+def _remove_part(f, tmp_path: str) -> None:
+    """Close an unfinished fill's file and remove its partial file, if any."""
+    if f is not None:
+        f.close()
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+class DiskAudioCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()  # file id -> size, LRU first
+        self._filling: set[str] = set()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.evictions = 0
+        if self.enabled:
+            os.makedirs(root, exist_ok=True)
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, file_id: str) -> str:
+        return os.path.join(self.root, f"{file_id}{_SUFFIX}")
+
+    def _load(self) -> None:
+        """Index entries left by a previous process, oldest access first.
+
+        Only names this cache writes are touched: anything else in the
+        directory (subdirectories included) is ignored.
+        """
+        found = []
+        stale_before = time.time() - _STALE_PART_SECONDS
+        with os.scandir(self.root) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    if _PART_NAME.match(entry.name):
+                        # partial fill from a crash
+                        if stat.st_mtime < stale_before:
+                            os.remove(entry.path)
+                        continue
+                except FileNotFoundError:
+                    continue  # finished or evicted by another worker meanwhile
+                match = _ENTRY_NAME.match(entry.name)
+                if match:
+                    found.append((stat.st_atime, match.group(1), stat.st_size))
+        for _, file_id, size in sorted(found):
+            self._entries[file_id] = size
+            self._bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            file_id, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(file_id))
+            except FileNotFoundError:
+                pass
+
+    def lookup(self, file_id: str) -> str | None:
+        """Return the cached file's path (counting a hit) or None (a miss)."""
+        if not self.enabled:
+            return None
+        if file_id in self._entries and os.path.exists(self._path(file_id)):
+            self._entries.move_to_end(file_id)
+            self.hits += 1
+            return self._path(file_id)
+        if file_id in self._entries:
+            # removed from disk behind our back
+            self.discard(file_id)
+        self.misses += 1
+        return None
+
+    def discard(self, file_id: str) -> None:
+        size = self._entries.pop(file_id, None)
+        if size is not None:
+            self._bytes -= size
+        try:
+            os.remove(self._path(file_id))
+        except FileNotFoundError:
+            pass
+
+    async def fill(self, file_id: str, chunks: AsyncIterator[bytes], length: int) -> AsyncIterator[bytes]:
+        """Pass `chunks` through to the client, writing them to the cache too.
+
+        The entry is only published once the whole file (exactly `length`
+        bytes) has been written, so a client that disconnects mid-stream
+        leaves nothing behind.
+        """
+        if not self.enabled or length > self.max_bytes or file_id in self._filling:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        self._filling.add(file_id)
+        tmp_path = os.path.join(self.root, f"{file_id}.{secrets.token_hex(4)}.part")
+        written = 0
+        f = None
+        # File I/O runs in threads so a slow disk never stalls the event loop.
+        try:
+            f = await asyncio.to_thread(self._open_for_fill, tmp_path)
+            async for chunk in chunks:
+                if f is not None:
+                    try:
+                        await asyncio.to_thread(f.write, chunk)
+                        written += len(chunk)
+                    except OSError as e:
+                        # a full or read-only disk must never break playback
+                        logger.warning(f"Audio cache fill failed for {file_id}: {e}")
+                        await asyncio.to_thread(f.close)
+                        f = None
+                yield chunk
+            if f is not None:
+                await asyncio.to_thread(f.close)
+                f = None
+                if written == length:
+                    await self._publish(file_id, tmp_path, length)
+        finally:
+            self._filling.discard(file_id)
+            # one thread call, so the cleanup completes even if we're cancelled meanwhile
+            await asyncio.to_thread(_remove_part, f, tmp_path)
+
+    def _open_for_fill(self, tmp_path: str):
+        try:
+            return open(tmp_path, "wb")
+        except OSError as e:
+            logger.warning(f"Audio cache unavailable: {e}")
+            return None
+
+    async def _publish(self, file_id: str, tmp_path: str, length: int) -> None:
+        try:
+            await asyncio.to_thread(os.replace, tmp_path, self._path(file_id))
+        except OSError as e:
+            logger.warning(f"Audio cache fill failed for {file_id}: {e}")
+            return
+        self._bytes += length - self._entries.get(file_id, 0)
+        self._entries[file_id] = length
+        self._entries.move_to_end(file_id)
+        self.fills += 1
+        self._evict()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "fills": self.fills,
+            "evictions": self.evictions,
+        }
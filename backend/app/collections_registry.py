@@ -0,0 +1,82 @@
+"""In-process registry of the collection names in the portfolio database.
+
+Every `/songs/*` route validates its collection before running the real
+query. Asking Mongo with `list_collection_names()` each time doubles the
+round-trips for the hottest routes, so the names are cached here with a TTL,
+refreshed in the background, and updated explicitly when this process
+creates a collection.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionRegistry:
+    def __init__(self, db, ttl: float = 300.0, miss_refresh_interval: float = 5.0):
+        self._db = db
+        self._ttl = ttl
+        # Collections created by another process (e.g. scripts/sync_songs.py)
+        # show up on a miss, but no more often than this so a stream of
+        # requests for bogus names can't turn back into one catalog query each.
+        self._miss_refresh_interval = miss_refresh_interval
+        self._names: set[str] = set()
+        self._refreshed_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _age(self) -> float:
+        if self._refreshed_at is None:
+            return float("inf")
+        return time.monotonic() - self._refreshed_at
+
+    async def refresh(self) -> None:
+        names = await self._db.list_collection_names()
+        self._names = set(names)
+        self._refreshed_at = time.monotonic()
+
+    async def _refresh_if_older_than(self, max_age: float) -> None:
+        if self._age() < max_age:
+            return
+        async with self._lock:
+            # another request may have refreshed while we waited on the lock
+            if self._age() >= max_age:
+                await self.refresh()
+
+    async def exists(self, name: str) -> bool:
+        await self._refresh_if_older_than(self._ttl)
+        if name in self._names:
+            return True
+        await self._refresh_if_older_than(self._miss_refresh_interval)
+        return name in self._names
+
+    def add(self, name: str) -> None:
+        """Record a collection this process just created."""
+        self._names.add(name)
+
+    def invalidate(self) -> None:
+        """Force the next lookup to re-read the catalog."""
+        self._refreshed_at = None
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._ttl)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Background collection refresh failed: {e}")
+
+    def start(self) -> None:
+        """Refresh in the background so request paths rarely see a stale entry."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
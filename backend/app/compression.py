@@ -0,0 +1,130 @@
+"""gzip/brotli content negotiation for JSON responses.
+
+Song lists are dominated by long, repetitive Spotify image URLs and compress
+5-10x, which matters on mobile. Only JSON is ever compressed: audio is
+already compressed and served with byte ranges (a Content-Encoding would
+make the ranges refer to the encoded bytes), and the resume PDF is mostly
+compressed streams too. Bodies under COMPRESSION_MIN_BYTES are sent as-is,
+since the encoding overhead outweighs the saving.
+
+Brotli is used when the `brotli` package is installed and the client
+accepts it; otherwise gzip. The cached list endpoints compress once per
+response cache entry (see `ResponseCache.variant`) and set Content-Encoding
+themselves; `CompressionMiddleware` compresses every other JSON body.
+"""
+
+import gzip
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_MEDIA_TYPES = ("application/json",)
+
+
+def _accepted(accept_encoding: str) -> dict[str, float]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """The content coding to use for a client's Accept-Encoding, or None."""
+    if not accept_encoding:
+        return None
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 so the same body always compresses to the same bytes
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def is_compressible(media_type: str | None) -> bool:
+    return bool(media_type) and media_type.split(";")[0].strip().lower() in COMPRESSIBLE_MEDIA_TYPES
+
+
+def add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing single-message JSON responses.
+
+    Responses that already carry a Content-Encoding (the cached list
+    endpoints), streamed responses and non-JSON media types pass through
+    untouched.
+    """
+
+    def __init__(self, app, min_bytes: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.min_bytes = min_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if not is_compressible(headers.get("content-type")) or "content-encoding" in headers:
+                    await send(message)
+                    return
+                add_vary(headers)
+                if encoding is None:
+                    await send(message)
+                    return
+                # hold the headers until the body shows whether to compress
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body" and start_message is not None:
+                held, start_message = start_message, None
+                body = message.get("body", b"")
+                if not message.get("more_body", False) and len(body) >= self.min_bytes:
+                    body = compress(body, encoding)
+                    headers = MutableHeaders(scope=held)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    message = {**message, "body": body}
+                await send(held)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,76 @@
+"""Conditional GET helpers (RFC 9110 section 13) for GridFS-backed routes.
+
+GridFS files are never modified in place: re-uploading audio or a resume
+creates a new file id. That makes (file id, upload date, length) a strong
+validator that can be computed from the `fs.files` document alone, so a
+revalidation hit costs one metadata lookup and never opens a download stream.
+Bodies assembled per request (`/bootstrap`) are validated by a hash instead.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Response
+
+from app.ranges import as_utc
+
+# Per-route Cache-Control policies. Audio URLs keep serving the same song even
+# when its audio is re-attached, so allow an hour before revalidating. The
+# resume is replaced in place, so clients always revalidate (cheaply, via 304).
+AUDIO_CACHE_CONTROL = os.getenv("AUDIO_CACHE_CONTROL", "public, max-age=3600")
+RESUME_CACHE_CONTROL = os.getenv("RESUME_CACHE_CONTROL", "public, no-cache")
+BOOTSTRAP_CACHE_CONTROL = os.getenv("BOOTSTRAP_CACHE_CONTROL", "public, no-cache")
+
+
+def gridfs_etag(file_id, upload_date: datetime | None, length: int) -> str:
+    """Strong ETag derived from the GridFS file id, upload date and length."""
+    uploaded = int(as_utc(upload_date).timestamp() * 1000) if upload_date else 0
+    return f'"{file_id}-{uploaded:x}-{length:x}"'
+
+
+def body_etag(body: bytes) -> str:
+    """ETag from a hash of the uncompressed body. Weak, because the same tag is
+    sent for the gzip, brotli and identity encodings of that body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def validator_headers(etag: str, last_modified: datetime | None, cache_control: str) -> dict[str, str]:
+    """Headers shared by 200, 206 and 304 responses for the same file."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore W/ prefixes on both sides.
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+
+def is_not_modified(request_headers, etag: str, last_modified: datetime | None) -> bool:
+    """True when the client's cached copy is still current.
+
+    `If-None-Match` takes precedence; `If-Modified-Since` is only consulted
+    when the client sent no entity tags.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return int(as_utc(last_modified).timestamp()) <= int(as_utc(since).timestamp())
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,50 @@
+"""Opt-in fast JSON path for the list endpoints.
+
+By default list handlers return dicts that FastAPI validates one by one
+against the response model and then encodes, which for a large song
+collection costs more CPU than reading it from Mongo. With
+FAST_JSON_RESPONSES enabled they instead:
+
+  * fetch only the response model's fields (`model_projection`), so fields
+    like shuffle keys and sort keys never leave Mongo, and
+  * encode the documents directly with orjson (`dump_documents`), filling in
+    the model's defaults for optional fields a document lacks so the output
+    has the same shape as the validated one.
+
+This covers the full and sampled song listings and the cached /projects and
+/experiences bodies; cursor pages (at most MAX_SONG_PAGE_SIZE songs) keep the
+validated path.
+
+Nothing is validated or coerced per request, so this relies on documents
+being written through the API's models. `scripts/bench_serialization.py`
+validates the fast output against the response models while it measures
+both paths.
+"""
+
+import os
+
+import orjson
+from pydantic import BaseModel
+
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+
+def model_projection(model: type[BaseModel]) -> dict[str, int]:
+    """Mongo projection for the fields of a `*Response` model (`id` comes from `_id`)."""
+    return {name: 1 for name in model.model_fields if name != "id"}
+
+
+def model_defaults(model: type[BaseModel]) -> dict:
+    """Defaults of the model's optional fields, to fill in what a document lacks."""
+    return {name: field.default for name, field in model.model_fields.items() if not field.is_required()}
+
+
+def dump_documents(documents: list[dict], defaults: dict | None = None) -> bytes:
+    """Encode projected Mongo documents as a JSON array, `_id` renamed to `id`."""
+    defaults = defaults or {}
+    items = []
+    for doc in documents:
+        item = {**defaults, **doc}
+        item["id"] = str(item.pop("_id"))
+        items.append(item)
+    return orjson.dumps(items)
@@ -0,0 +1,87 @@
+"""Cached database health for the liveness/readiness probes.
+
+Railway's healthcheck, load balancers and uptime monitors all poll the
+health endpoints. Pinging Mongo on every probe takes pool connections away
+from real traffic, so a background task pings at a fixed interval and the
+probes only read the cached result:
+
+  * liveness (`/health/live`) never touches Mongo: the process is up and its
+    event loop is answering.
+  * readiness (`/health/ready`, and `/health` for existing probes) is healthy
+    when the last ping succeeded and is recent. A ping result older than a
+    few intervals means the pinger itself is stuck, which also counts as
+    not ready.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    def __init__(self, db, interval: float = 5.0, timeout: float = 2.0, stale_after: float | None = None):
+        self._db = db
+        self._interval = interval
+        self._timeout = timeout
+        self._stale_after = stale_after if stale_after is not None else interval * 3
+        self._ok: bool | None = None  # None until the first ping finishes
+        self._error: str | None = None
+        self._checked_at: float | None = None
+        self._latency: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def check(self) -> bool:
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._db.command("ping"), timeout=self._timeout)
+            self._ok, self._error = True, None
+        except Exception as e:
+            if self._ok is not False:
+                logger.warning(f"Database ping failed: {e!r}")
+            self._ok, self._error = False, str(e) or type(e).__name__
+        self._checked_at = time.monotonic()
+        self._latency = self._checked_at - start
+        return self._ok
+
+    def _age(self) -> float | None:
+        return None if self._checked_at is None else time.monotonic() - self._checked_at
+
+    @property
+    def ready(self) -> bool:
+        age = self._age()
+        return bool(self._ok) and age is not None and age <= self._stale_after
+
+    def status(self) -> dict:
+        age = self._age()
+        if self._ok is None:
+            error = "No database ping has completed yet"
+        elif self._ok and not self.ready:
+            error = f"Last database ping was {age:.0f}s ago"
+        else:
+            error = self._error
+        return {
+            "status": "healthy" if self.ready else "unhealthy",
+            "database": "connected" if self.ready else "unavailable",
+            "error": error,
+            "checked_seconds_ago": None if age is None else round(age, 3),
+            "ping_ms": None if self._latency is None else round(self._latency * 1000, 2),
+        }
+
+    async def _ping_forever(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self._interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._ping_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -0,0 +1,97 @@
+"""Segmented (HLS) delivery of song audio.
+
+With segments enabled, ingest also cuts the MP3 into short MPEG-TS segments
+(the audio is copied, not re-encoded) and stores each one as its own GridFS
+file. The API serves a VOD playlist plus one endpoint per segment, so a
+player can start as soon as the first few seconds arrive, prefetch the rest
+in parallel, and seek by fetching a segment instead of a byte range.
+
+The song document records the segments as
+`audio_segments: {"segment_seconds": N, "segments": [{"file_id", "duration"}]}`.
+"""
+
+import math
+import os
+import subprocess
+
+SEGMENT_CONTENT_TYPE = "video/mp2t"
+PLAYLIST_MEDIA_TYPE = "application/vnd.apple.mpegurl"
+
+
+def segment_audio_file(src_path: str, dest_dir: str, segment_seconds: int) -> list[tuple[str, float]]:
+    """Synchronous ffmpeg split of `src_path` into segments inside `dest_dir`.
+    Run inside an executor for use from async code.
+
+    Returns `(path, duration)` for each segment in order. Raises Exception on
+    any failure.
+    """
+    playlist_path = os.path.join(dest_dir, "index.m3u8")
+    command = [
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        src_path,
+        "-vn",
+        "-c:a",
+        "copy",
+        "-f",
+        "hls",
+        "-hls_time",
+        str(segment_seconds),
+        "-hls_list_size",
+        "0",
+        "-hls_playlist_type",
+        "vod",
+        "-hls_segment_filename",
+        os.path.join(dest_dir, "segment%04d.ts"),
+        playlist_path,
+    ]
+    try:
+        subprocess.run(command, check=True, capture_output=True)
+        with open(playlist_path) as f:
+            segments = parse_playlist(f.read())
+    except subprocess.CalledProcessError as e:
+        raise Exception(f"Failed to segment audio: {e.stderr.decode(errors='replace').strip()}")
+    except OSError as e:
+        raise Exception(f"Failed to segment audio: {str(e)}") from e
+    if not segments:
+        raise Exception("Failed to segment audio: no segments were written")
+    return [(os.path.join(dest_dir, uri), duration) for uri, duration in segments]
+
+
+def parse_playlist(text: str) -> list[tuple[str, float]]:
+    """`(uri, duration)` pairs from an HLS media playlist."""
+    segments = []
+    duration = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#EXTINF:"):
+            duration = float(line[len("#EXTINF:") :].split(",", 1)[0])
+        elif line and not line.startswith("#") and duration is not None:
+            segments.append((line, duration))
+            duration = None
+    return segments
+
+
+def render_playlist(segments: list[dict], segment_uri: str = "segments/{index}") -> str:
+    """VOD media playlist for a song's stored `audio_segments["segments"]`.
+
+    `segment_uri` is relative to the playlist URL, so the same playlist works
+    behind any prefix or proxy.
+    """
+    target = max((math.ceil(segment["duration"]) for segment in segments), default=1)
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{target}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    for index, segment in enumerate(segments):
+        lines.append(f"#EXTINF:{segment['duration']:.3f},")
+        lines.append(segment_uri.format(index=index))
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,278 @@
+"""Concurrent audio ingest: YouTube Music search -> yt-dlp download -> GridFS upload.
+
+Each song moves through three stages. Every stage has its own concurrency
+limit, shared by all requests in the process, so a large backfill keeps the
+network busy without starting an unbounded number of yt-dlp processes. The
+blocking stages run on long-lived thread pools instead of a new executor per
+song: yt-dlp downloads on their own pool, sized to the download limit, and
+the ytmusicapi search and ffmpeg transcodes on another, so downloads that
+hang past their timeout can't starve the other stages of threads.
+
+After the MP3 is stored, the renditions named in INGEST_AUDIO_VARIANTS (see
+`app.audio.AUDIO_VARIANTS`) are transcoded with ffmpeg and stored alongside
+it; a failed transcode only loses that rendition, never the song. With
+segments enabled (INGEST_AUDIO_SEGMENTS, or per request) the MP3 is also cut
+into HLS segments the same way (see `app.hls`).
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from bson import ObjectId
+
+from app.audio import AUDIO_VARIANTS, StoredAudio, download_audio_file, transcode_audio_file, upload_audio_file
+from app.hls import SEGMENT_CONTENT_TYPE, segment_audio_file
+from app.matching import MATCH_THRESHOLD, pick_youtube_match
+from app.metrics import ytdlp_download_duration_seconds
+from app.search_cache import search_cache
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONCURRENCY = int(os.getenv("INGEST_SEARCH_CONCURRENCY", "4"))
+DOWNLOAD_CONCURRENCY = int(os.getenv("INGEST_DOWNLOAD_CONCURRENCY", "3"))
+UPLOAD_CONCURRENCY = int(os.getenv("INGEST_UPLOAD_CONCURRENCY", "4"))
+TRANSCODE_CONCURRENCY = int(os.getenv("INGEST_TRANSCODE_CONCURRENCY", "2"))
+DOWNLOAD_TIMEOUT = float(os.getenv("INGEST_DOWNLOAD_TIMEOUT", "60"))
+# comma-separated names from app.audio.AUDIO_VARIANTS; empty disables them
+INGEST_AUDIO_VARIANTS = [
+    name.strip() for name in os.getenv("INGEST_AUDIO_VARIANTS", "opus96,opus64").split(",") if name.strip()
+]
+INGEST_AUDIO_SEGMENTS = os.getenv("INGEST_AUDIO_SEGMENTS", "false").lower() in ("1", "true", "yes")
+SEGMENT_SECONDS = int(os.getenv("INGEST_SEGMENT_SECONDS", "6"))
+
+# The search, download and transcode stages block a thread; uploads are async.
+INGEST_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SEARCH_CONCURRENCY + TRANSCODE_CONCURRENCY, thread_name_prefix="ingest"
+)
+DOWNLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY, thread_name_prefix="ingest-download")
+
+_search_slots = asyncio.Semaphore(SEARCH_CONCURRENCY)
+_download_slots = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+_upload_slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+_transcode_slots = asyncio.Semaphore(TRANSCODE_CONCURRENCY)
+# cleanup tasks for timed-out downloads, referenced so they aren't collected
+_abandoned_downloads: set[asyncio.Task] = set()
+
+
+class IngestError(Exception):
+    """A song could not be ingested; the message is the user-facing reason."""
+
+
+async def _run_blocking(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(INGEST_EXECUTOR, func, *args)
+
+
+async def search_youtube_url(get_ytmusic: Callable, title: str, artist: str) -> str:
+    """Search stage: resolve a song to the YouTube URL of its best match.
+
+    Results (including ones with no match) come from the persistent search
+    cache when it has them, so reruns don't search again for failed songs.
+    """
+    search_results = await _run_blocking(search_cache.get, title, artist)
+    if search_results is None:
+        async with _search_slots:
+            ytmusic_client = get_ytmusic()
+            search_results = await _run_blocking(lambda: ytmusic_client.search(f"{title} {artist}", filter="songs"))
+        match = pick_youtube_match(title, artist, search_results)
+        await _run_blocking(search_cache.put, title, artist, search_results or [], match is not None)
+    else:
+        match = pick_youtube_match(title, artist, search_results)
+
+    if not search_results:
+        raise IngestError("No YouTube results found")
+
+    # take the best result whose title AND artist are close enough;
+    # otherwise skip rather than blindly downloading the wrong upload
+    if not match:
+        top = search_results[0]
+        top_title = top.get("title") or "?"
+        top_artist = " ".join(a.get("name", "") for a in (top.get("artists") or [])) or "?"
+        raise IngestError(f"No YouTube title+artist match >={MATCH_THRESHOLD} (top: {top_title!r} by {top_artist!r})")
+    return f"https://www.youtube.com/watch?v={match['videoId']}"
+
+
+async def _reap_download(future: asyncio.Future, temp_dir: str) -> None:
+    """Wait for an abandoned yt-dlp call to return, then free its slot and directory."""
+    try:
+        with contextlib.suppress(Exception):
+            await future
+    finally:
+        _download_slots.release()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@contextlib.asynccontextmanager
+async def download_audio(youtube_url: str) -> AsyncIterator[str]:
+    """Download stage: run yt-dlp on the download pool with a timeout.
+
+    Yields the path of the downloaded MP3 in a temporary directory that is
+    removed on exit. A yt-dlp call can't be interrupted, so after a timeout
+    (or cancellation) it keeps its download slot and directory until it
+    actually returns, rather than having another download start beside it
+    and its directory deleted while yt-dlp and ffmpeg still write into it.
+    """
+    await _download_slots.acquire()
+    temp_dir = tempfile.mkdtemp(prefix="ingest-")
+    future = asyncio.get_running_loop().run_in_executor(DOWNLOAD_EXECUTOR, download_audio_file, youtube_url, temp_dir)
+    try:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            path = await asyncio.wait_for(asyncio.shield(future), timeout=DOWNLOAD_TIMEOUT)
+            outcome = "ok"
+        except TimeoutError:
+            outcome = "timeout"
+            raise IngestError("Download timeout")
+        finally:
+            ytdlp_download_duration_seconds.observe(time.perf_counter() - start, outcome=outcome)
+            # the slot bounds running yt-dlp calls, not the upload that follows
+            if future.done():
+                _download_slots.release()
+        yield path
+    finally:
+        if future.done():
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        else:
+            task = asyncio.create_task(_reap_download(future, temp_dir))
+            _abandoned_downloads.add(task)
+            task.add_done_callback(_abandoned_downloads.discard)
+
+
+async def upload_audio(fs, title: str, path: str) -> StoredAudio:
+    """Upload stage: stream the MP3 from disk into GridFS."""
+    async with _upload_slots:
+        return await upload_audio_file(fs, path, f"{title}.mp3")
+
+
+async def store_audio_variants(fs, title: str, path: str, names: list[str] | None = None) -> dict[str, str]:
+    """Transcode stage: store each named rendition of the MP3 at `path`.
+
+    `names` defaults to INGEST_AUDIO_VARIANTS. Returns {variant name: GridFS
+    file id} for the renditions that succeeded.
+    """
+    if names is None:
+        names = INGEST_AUDIO_VARIANTS
+
+    async def store(name: str) -> tuple[str, str] | None:
+        variant = AUDIO_VARIANTS[name]
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                async with _transcode_slots:
+                    variant_path = await _run_blocking(transcode_audio_file, path, temp_dir, variant)
+                async with _upload_slots:
+                    stored = await upload_audio_file(
+                        fs, variant_path, f"{title}.{variant.name}.{variant.extension}", variant.content_type
+                    )
+        except Exception as e:
+            logger.warning(f"Skipping {name} variant for {title!r}: {e}")
+            return None
+        return name, str(stored.file_id)
+
+    results = await asyncio.gather(*(store(name) for name in names if name in AUDIO_VARIANTS))
+    return dict(result for result in results if result)
+
+
+async def store_audio_segments(fs, title: str, path: str) -> dict | None:
+    """Segment stage: cut the MP3 at `path` into HLS segments and store them.
+
+    Returns the song's `audio_segments` field, or None if segmenting failed
+    (any segments already uploaded are removed again).
+    """
+    stored: list[dict] = []
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            async with _transcode_slots:
+                segments = await _run_blocking(segment_audio_file, path, temp_dir, SEGMENT_SECONDS)
+            async with _upload_slots:
+                for index, (segment_path, duration) in enumerate(segments):
+                    segment = await upload_audio_file(fs, segment_path, f"{title}.{index:04d}.ts", SEGMENT_CONTENT_TYPE)
+                    stored.append({"file_id": str(segment.file_id), "duration": duration})
+    except Exception as e:
+        logger.warning(f"Skipping segments for {title!r}: {e}")
+        for segment in stored:
+            await fs.delete(ObjectId(segment["file_id"]))
+        return None
+    return {"segment_seconds": SEGMENT_SECONDS, "segments": stored}
+
+
+async def store_audio(fs, title: str, path: str, segmented: bool | None = None) -> dict:
+    """Store the MP3 at `path` plus its variants (and segments, if `segmented`,
+    which defaults to INGEST_AUDIO_SEGMENTS).
+
+    Returns the song document fields that point at the stored audio.
+    """
+    if segmented is None:
+        segmented = INGEST_AUDIO_SEGMENTS
+    stored = await upload_audio(fs, title, path)
+    fields: dict = {"audio_file_id": str(stored.file_id)}
+    if segmented:
+        variants, segments = await asyncio.gather(
+            store_audio_variants(fs, title, path), store_audio_segments(fs, title, path)
+        )
+        if segments:
+            fields["audio_segments"] = segments
+    else:
+        variants = await store_audio_variants(fs, title, path)
+    fields["audio_variants"] = variants
+    return fields
+
+
+async def fetch_and_store_audio(fs, title: str, youtube_url: str, segmented: bool | None = None) -> dict:
+    """Download then store (see `store_audio`), keeping the audio on disk
+    (never fully in memory) until it has been streamed into GridFS."""
+    async with download_audio(youtube_url) as path:
+        return await store_audio(fs, title, path, segmented)
+
+
+def song_audio_file_ids(song: dict) -> list[str]:
+    """Every GridFS file id a song document points at: MP3, variants, segments."""
+    file_ids = [song["audio_file_id"]] if song.get("audio_file_id") else []
+    file_ids += (song.get("audio_variants") or {}).values()
+    file_ids += [segment["file_id"] for segment in (song.get("audio_segments") or {}).get("segments", [])]
+    return file_ids
+
+
+async def ingest_song(collection, fs, get_ytmusic: Callable, song: dict, segmented: bool | None = None) -> None:
+    """Search, download and upload one song, then record the result on it."""
+    youtube_url = await search_youtube_url(get_ytmusic, song["title"], song["artist"])
+    fields = await fetch_and_store_audio(fs, song["title"], youtube_url, segmented)
+    await collection.update_one({"_id": song["_id"]}, {"$set": {"youtube_link": youtube_url, **fields}})
+
+
+async def ingest_songs(
+    collection,
+    fs,
+    get_ytmusic: Callable,
+    songs: list[dict],
+    on_result: Callable[[dict, str | None], Awaitable[None]] | None = None,
+    segmented: bool | None = None,
+) -> tuple[int, list[dict]]:
+    """Run `ingest_song` for every song concurrently, bounded by the stage limits.
+
+    `on_result(song, reason)` is awaited as each song finishes, with `reason`
+    None on success; `segmented` overrides INGEST_AUDIO_SEGMENTS. Returns the
+    number of songs processed and a list of failures in the same shape the
+    `/process-missing` endpoint has always reported.
+    """
+    failed_songs: list[dict] = []
+
+    async def run(song: dict) -> bool:
+        reason = None
+        try:
+            await ingest_song(collection, fs, get_ytmusic, song, segmented)
+        except Exception as e:
+            reason = str(e)
+            failed_songs.append({"title": song["title"], "artist": song["artist"], "reason": reason})
+        if on_result is not None:
+            await on_result(song, reason)
+        return reason is None
+
+    results = await asyncio.gather(*(run(song) for song in songs))
+    return sum(results), failed_songs
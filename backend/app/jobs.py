@@ -0,0 +1,274 @@
+"""In-process background jobs with their state persisted in Mongo.
+
+Audio ingestion runs yt-dlp for every song, which takes far longer than a
+proxy will keep an HTTP request open. Submit endpoints instead record a job
+in the `jobs` collection and return its id, a small pool of worker tasks runs
+the job, and `GET /jobs/{id}` reports per-item status, throughput and ETA.
+
+Job state (including per-item results) lives in Mongo, so jobs that were
+queued or running when the process stopped are picked up again on startup,
+and handlers can skip the items an earlier run already finished.
+
+Several processes can share the `jobs` collection (`--workers N`, or an old
+and a new deploy overlapping), so a job is only run after atomically
+claiming it: QUEUED, or RUNNING with an expired lease. The owner renews the
+lease while the handler runs; a process that dies stops renewing, and once
+the lease lapses any process's periodic sweep claims the job again.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+ITEM_PENDING = "pending"
+ITEM_DONE = "done"
+ITEM_FAILED = "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+class JobContext:
+    """Handle passed to a job handler for reading params and reporting progress."""
+
+    def __init__(self, collection, job: dict):
+        self._collection = collection
+        self.id: ObjectId = job["_id"]
+        self.params: dict = job.get("params") or {}
+        self.items: dict[str, dict] = job.get("items") or {}
+
+    def finished(self, key: str) -> bool:
+        """True if a previous run of this job already handled `key`."""
+        return self.items.get(key, {}).get("status") == ITEM_DONE
+
+    async def add_items(self, items: dict[str, str]) -> None:
+        """Register work items as {key: label}. Keys already known keep their status."""
+        new = {key: {"label": label, "status": ITEM_PENDING} for key, label in items.items() if key not in self.items}
+        self.items.update(new)
+        fields = {f"items.{key}": item for key, item in new.items()}
+        await self._collection.update_one({"_id": self.id}, {"$set": {**fields, "total": len(self.items)}})
+
+    async def item_done(self, key: str, error: str | None = None) -> None:
+        status = ITEM_FAILED if error else ITEM_DONE
+        self.items.setdefault(key, {})["status"] = status
+        update: dict = {"$set": {f"items.{key}.status": status, f"items.{key}.finished_at": _now()}}
+        if error:
+            update["$set"][f"items.{key}.reason"] = error
+        await self._collection.update_one({"_id": self.id}, update)
+
+    async def set_result(self, result: dict) -> None:
+        await self._collection.update_one({"_id": self.id}, {"$set": {"result": result}})
+
+
+JobHandler = Callable[[JobContext], Awaitable[None]]
+
+
+class JobManager:
+    def __init__(self, collection, workers: int = 1, lease_seconds: float = 60.0):
+        self._collection = collection
+        self._workers = workers
+        self._lease = timedelta(seconds=lease_seconds)
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: dict[str, JobHandler] = {}
+        # created in start() so it belongs to the running event loop
+        self._queue: asyncio.Queue[ObjectId] | None = None
+        self._pending: set[ObjectId] = set()  # queued or running in this process
+        self._tasks: list[asyncio.Task] = []
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        self._handlers[job_type] = handler
+
+    async def submit(self, job_type: str, params: dict) -> str:
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type {job_type!r}")
+        result = await self._collection.insert_one(
+            {"type": job_type, "params": params, "status": QUEUED, "created_at": _now(), "items": {}, "total": 0}
+        )
+        # before start() the job just stays QUEUED in Mongo; start() picks it up
+        await self._enqueue(result.inserted_id)
+        return str(result.inserted_id)
+
+    async def _enqueue(self, job_id: ObjectId) -> None:
+        if self._queue is not None and job_id not in self._pending:
+            self._pending.add(job_id)
+            await self._queue.put(job_id)
+
+    def _claimable(self) -> dict:
+        return {
+            "$or": [
+                {"status": QUEUED},
+                # no lease_until: left RUNNING by a version without leases
+                {"status": RUNNING, "lease_until": {"$not": {"$gt": _now()}}},
+            ]
+        }
+
+    async def _claim(self, job_id: ObjectId) -> dict | None:
+        """Atomically take ownership of a job; None if another process holds it or it's done."""
+        return await self._collection.find_one_and_update(
+            {"_id": job_id, **self._claimable()},
+            {"$set": {"status": RUNNING, "owner": self._owner, "lease_until": _now() + self._lease}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _keep_lease(self, job_id: ObjectId, handler_task: asyncio.Task, lost: list[bool]) -> None:
+        """Renew the lease until cancelled; cancel the handler if another process took the job."""
+        while True:
+            await asyncio.sleep(self._lease.total_seconds() / 3)
+            try:
+                result = await self._collection.update_one(
+                    {"_id": job_id, "owner": self._owner},
+                    {"$set": {"lease_until": _now() + self._lease}},
+                )
+            except Exception as e:
+                logger.warning(f"Failed to renew lease on job {job_id}: {e}")
+                continue
+            if result.matched_count == 0:
+                logger.warning(f"Lost the lease on job {job_id}; stopping it here")
+                lost[0] = True
+                handler_task.cancel()
+                return
+
+    async def get(self, job_id: str) -> dict | None:
+        if not ObjectId.is_valid(job_id):
+            return None
+        job = await self._collection.find_one({"_id": ObjectId(job_id)})
+        return _describe(job) if job else None
+
+    async def _run(self, job_id: ObjectId) -> None:
+        job = await self._claim(job_id)
+        if not job:
+            return
+        owned = {"_id": job_id, "owner": self._owner}
+        handler = self._handlers.get(job["type"])
+        if handler is None:
+            await self._collection.update_one(
+                owned, {"$set": {"status": FAILED, "error": f"Unknown job type {job['type']!r}"}}
+            )
+            return
+
+        if not job.get("started_at"):
+            await self._collection.update_one(owned, {"$set": {"started_at": _now()}})
+        handler_task = asyncio.create_task(handler(JobContext(self._collection, job)))
+        lost = [False]
+        renewer = asyncio.create_task(self._keep_lease(job_id, handler_task, lost))
+        try:
+            await handler_task
+        except asyncio.CancelledError:
+            if lost[0]:
+                return
+            # shutting down: leave the job RUNNING but give up the lease so a
+            # sweep in another (or the next) process resumes it right away
+            with contextlib.suppress(Exception):
+                await self._collection.update_one(owned, {"$set": {"lease_until": _now()}})
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            await self._collection.update_one(
+                owned, {"$set": {"status": FAILED, "error": str(e), "finished_at": _now()}}
+            )
+            return
+        finally:
+            renewer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await renewer
+        await self._collection.update_one(owned, {"$set": {"status": COMPLETED, "finished_at": _now()}})
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker error on {job_id}: {e}", exc_info=True)
+            finally:
+                self._pending.discard(job_id)
+                self._queue.task_done()
+
+    async def _sweep(self) -> None:
+        """Queue jobs that are waiting, or whose owner stopped renewing its lease."""
+        try:
+            async for job in self._collection.find(self._claimable(), {"_id": 1}).sort("created_at", 1):
+                await self._enqueue(job["_id"])
+        except Exception as e:
+            logger.warning(f"Failed to re-queue unfinished jobs: {e}")
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await self._sweep()
+            await asyncio.sleep(self._lease.total_seconds())
+
+    async def start(self) -> None:
+        """Start the workers and the sweep that picks up jobs left unfinished by other processes."""
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._sweep_forever()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        self._pending.clear()
+        self._queue = None
+
+
+def _describe(job: dict) -> dict:
+    """Public view of a job document with progress, throughput and ETA."""
+    items = job.get("items") or {}
+    done = sum(1 for item in items.values() if item.get("status") == ITEM_DONE)
+    failed = sum(1 for item in items.values() if item.get("status") == ITEM_FAILED)
+    total = job.get("total") or len(items)
+    finished = done + failed
+
+    throughput = None
+    eta_seconds = None
+    started_at = job.get("started_at")
+    if started_at and finished:
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=UTC)
+        end = job.get("finished_at") or _now()
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=UTC)
+        elapsed = (end - started_at).total_seconds()
+        if elapsed > 0:
+            throughput = finished / elapsed
+            if job["status"] == RUNNING:
+                eta_seconds = (total - finished) / throughput
+
+    return {
+        "id": str(job["_id"]),
+        "type": job["type"],
+        "status": job["status"],
+        "params": job.get("params") or {},
+        "created_at": job.get("created_at"),
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+        "error": job.get("error"),
+        "result": job.get("result"),
+        "total": total,
+        "done": done,
+        "failed": failed,
+        "items_per_second": throughput,
+        "eta_seconds": eta_seconds,
+        "items": [{"key": key, **item} for key, item in items.items()],
+    }
@@ -1,26 +1,81 @@
 import asyncio
-import io
+import hashlib
 import logging
 import os
 import random
+import tempfile
 import urllib.parse
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Awaitable
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 
-import spotipy
 from bson import ObjectId
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
-from googleapiclient.discovery import build
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
-from pydantic import BaseModel
-from spotipy.oauth2 import SpotifyClientCredentials
-from ytmusicapi import YTMusic
-
-from app.audio import download_audio_sync, pick_youtube_match
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+from app.audio import AUDIO_VARIANTS
+from app.audio_cache import DiskAudioCache
+from app.collections_registry import CollectionRegistry
+from app.compression import COMPRESSION_MIN_BYTES, CompressionMiddleware, compress, negotiate_encoding
+from app.conditional import (
+    AUDIO_CACHE_CONTROL,
+    BOOTSTRAP_CACHE_CONTROL,
+    RESUME_CACHE_CONTROL,
+    body_etag,
+    gridfs_etag,
+    is_not_modified,
+    not_modified,
+    validator_headers,
+)
+from app.fast_json import FAST_JSON_RESPONSES, dump_documents, model_defaults, model_projection
+from app.health import HealthMonitor
+from app.hls import PLAYLIST_MEDIA_TYPE, SEGMENT_CONTENT_TYPE, render_playlist
+from app.ingest import IngestError, fetch_and_store_audio, ingest_songs, song_audio_file_ids
+from app.jobs import JobContext, JobManager
+from app.metrics import (
+    METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    MongoCommandListener,
+    count_gridfs_bytes,
+    monitor_event_loop,
+    render_metrics,
+)
+from app.mongo_settings import describe_client, mongo_client_options
+from app.ndjson import insert_ndjson
+from app.pagination import (
+    backfill_shuffle_keys,
+    decode_cursor,
+    encode_cursor,
+    seeded_order_expr,
+    with_shuffle_key,
+)
+from app.ranges import (
+    content_range,
+    if_range_matches,
+    iter_file_multipart_ranges,
+    iter_file_range,
+    iter_grid_range,
+    iter_multipart_ranges,
+    multipart_length,
+    new_boundary,
+    parse_range_header,
+)
+from app.response_cache import ResponseCache
+from app.resume_cache import CachedResume, ResumeCache
+from app.search_cache import search_cache
+from app.spotify import (
+    ensure_spotify_index,
+    existing_spotify_ids,
+    iter_playlist_tracks,
+    track_to_song,
+    upsert_songs,
+)
 
 # load environment variables
 load_dotenv()
@@ -33,8 +88,27 @@ logger = logging.getLogger(__name__)
 ENV = os.getenv("ENV", "dev")
 IS_PROD = ENV == "prod"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    health_monitor.start()
+    backfill = asyncio.create_task(_backfill_sort_keys_until_done())
+    collection_registry.start()
+    resume_cache.start()
+    await job_manager.start()
+    loop_monitor = asyncio.create_task(monitor_event_loop())
+    yield
+    loop_monitor.cancel()
+    backfill.cancel()
+    await job_manager.stop()
+    await collection_registry.stop()
+    await resume_cache.stop()
+    await health_monitor.stop()
+
+
 app = FastAPI(
     title="Portfolio Music API",
+    lifespan=lifespan,
     docs_url=None if IS_PROD else "/docs",
     redoc_url=None if IS_PROD else "/redoc",
     openapi_url=None if IS_PROD else "/openapi.json",
@@ -50,17 +124,69 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(MetricsMiddleware)
+# compresses the JSON bodies not already encoded by _json_response (song lists)
+app.add_middleware(CompressionMiddleware)
 
 # MongoDB connection
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-client = AsyncIOMotorClient(MONGODB_URL)
-db = client.portfolio
+MONGODB_DB = os.getenv("MONGODB_DB", "portfolio")
+# pool, timeout and compression settings come from MONGODB_* env vars (see app.mongo_settings)
+client = AsyncIOMotorClient(MONGODB_URL, event_listeners=[MongoCommandListener()], **mongo_client_options())
+db = client[MONGODB_DB]
 
 # GridFS setup for audio files
-fs = AsyncIOMotorGridFSBucket(client.portfolio)
+fs = AsyncIOMotorGridFSBucket(db)
+
+# Background Mongo pinger behind the readiness probe
+health_monitor = HealthMonitor(
+    db,
+    interval=float(os.getenv("HEALTH_CHECK_INTERVAL", "5")),
+    timeout=float(os.getenv("HEALTH_CHECK_TIMEOUT", "2")),
+)
+
+# Cached collection names so song routes don't list the catalog on every request
+COLLECTION_CACHE_TTL = float(os.getenv("COLLECTION_CACHE_TTL", "300"))
+collection_registry = CollectionRegistry(db, ttl=COLLECTION_CACHE_TTL)
+
+# Current resume PDF, served from memory (see app.resume_cache)
+resume_cache = ResumeCache(db, fs, ttl=float(os.getenv("RESUME_CACHE_TTL", "300")))
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+RESUME_UPLOAD_CHUNK_BYTES = 256 * 1024
+
+# `quality` names clients can use instead of a variant name
+AUDIO_QUALITY_ALIASES = {"low": "opus64", "medium": "opus96", "high": "original"}
 
-# Lazy-initialized API clients (see get_*_client below)
+# Local disk cache for hot audio files (see app.audio_cache); 0 disables it
+audio_cache = DiskAudioCache(
+    root=os.getenv("AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "portfolio-audio-cache")),
+    max_bytes=int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+)
+
+# Background ingest jobs (see app.jobs); handlers are registered next to the
+# routes that submit them
+job_manager = JobManager(
+    db.jobs, workers=int(os.getenv("JOB_WORKERS", "1")), lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", "60"))
+)
+
+# Song listing page sizes (see app.pagination)
+DEFAULT_SONG_PAGE_SIZE = 50
+MAX_SONG_PAGE_SIZE = 500
+_shuffle_keys_backfilled: set[str] = set()
+
+# Serialized bodies for the read-mostly portfolio endpoints
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "128")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "300")),
+)
+
+# Lazy-initialized API clients (see get_*_client below). Their libraries are
+# imported on first use as well: together they cost several hundred ms at
+# import time, which every worker start would otherwise pay before /health
+# can answer, while only the admin/ingest routes use them.
+# `python scripts/import_budget.py` checks they stay out of `import app.main`.
 youtube = None
 spotify = None
 ytmusic = None
@@ -73,6 +199,8 @@ def get_youtube_client():
         if not api_key:
             raise HTTPException(status_code=500, detail="YouTube API key not configured")
         try:
+            from googleapiclient.discovery import build
+
             youtube = build("youtube", "v3", developerKey=api_key)
         except Exception as e:
             logger.error(f"Failed to initialize YouTube client: {str(e)}")
@@ -88,6 +216,9 @@ def get_spotify_client():
         if not client_id or not client_secret:
             raise HTTPException(status_code=500, detail="Spotify credentials not configured")
         try:
+            import spotipy
+            from spotipy.oauth2 import SpotifyClientCredentials
+
             client_credentials_manager = SpotifyClientCredentials(client_id=client_id, client_secret=client_secret)
             spotify = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
         except Exception as e:
@@ -100,6 +231,8 @@ def get_ytmusic_client():
     global ytmusic
     if ytmusic is None:
         try:
+            from ytmusicapi import YTMusic
+
             ytmusic = YTMusic()
         except Exception as e:
             logger.error(f"Failed to initialize YTMusic client: {str(e)}")
@@ -110,14 +243,39 @@ def get_ytmusic_client():
 # helper function to check if a collection exists
 async def check_collection_exists(collection_name: str) -> tuple[bool, str]:
     try:
-        collections = await db.list_collection_names()
-        if collection_name not in collections:
+        if not await collection_registry.exists(collection_name):
             return False, f"Collection '{collection_name}' does not exist"
         return True, ""
     except Exception as e:
         return False, f"Error checking collection: {str(e)}"
 
 
+def _json_object(fields: dict[str, bytes | None]) -> bytes:
+    """Splice already-serialized JSON values into one object (None -> null)."""
+    members = [f'"{name}":'.encode() + (value if value is not None else b"null") for name, value in fields.items()]
+    return b"{" + b",".join(members) + b"}"
+
+
+def _json_response(body: bytes, request: Request | None = None, cache_key: str | None = None) -> Response:
+    """Wrap an already-serialized JSON body, skipping FastAPI's re-encoding.
+
+    With `request`, the body is compressed for the client's Accept-Encoding;
+    `cache_key` keeps the compressed bytes on that response cache entry so a
+    cached body is only compressed once per encoding.
+    """
+    if request is None:
+        return Response(content=body, media_type="application/json")
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None and len(body) >= COMPRESSION_MIN_BYTES:
+        if cache_key is not None:
+            body = response_cache.variant(cache_key, body, encoding, lambda raw: compress(raw, encoding))
+        else:
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 def _strip_mongo_id(doc: dict) -> dict:
     """Convert Mongo's _id ObjectId field to a string `id` field in-place."""
     doc["id"] = str(doc["_id"])
@@ -125,6 +283,11 @@ def _strip_mongo_id(doc: dict) -> dict:
     return doc
 
 
+async def _find_grid_file(file_id: ObjectId) -> dict | None:
+    """Fetch a GridFS `fs.files` document without opening a download stream."""
+    return await db["fs.files"].find_one({"_id": file_id})
+
+
 async def _fetch_by_object_id(collection, id_str: str, not_found_msg: str) -> dict:
     """Validate an ObjectId string, fetch the document, and raise standard HTTP errors."""
     if not ObjectId.is_valid(id_str):
@@ -135,11 +298,21 @@ async def _fetch_by_object_id(collection, id_str: str, not_found_msg: str) -> di
     return obj
 
 
-def _project_sort_key(project: dict) -> tuple:
-    """Sort key for /projects: explicit `level` ascending, then year descending."""
+# /projects order: explicit `level` ascending, then year descending. Mongo sorts
+# a missing/null level first, so documents store `sort_level` with None (no
+# priority) mapped to a large sentinel that pushes them to the end.
+_NO_LEVEL = 2**31 - 1
+PROJECT_SORT = [("sort_level", 1), ("year", -1)]
+
+
+def _project_sort_keys(project: dict) -> dict:
     level = project.get("level")
-    # None means no priority; push to end by using large sentinel
-    return (level if level is not None else float("inf"), -(project.get("year") or 0))
+    return {"sort_level": level if level is not None else _NO_LEVEL}
+
+
+def _with_project_sort_keys(project: dict) -> dict:
+    """Add the precomputed /projects sort key to a document about to be written."""
+    return {**project, **_project_sort_keys(project)}
 
 
 _MONTH_MAP = {
@@ -171,11 +344,64 @@ def _parse_experience_date(date_str: str) -> tuple[int, int]:
         return (0, 0)
 
 
+# /experiences order: end_date descending, then start_date descending, using
+# (year, month) pairs flattened to year * 100 + month so Mongo can sort them.
+EXPERIENCE_SORT = [("sort_end", -1), ("sort_start", -1)]
+
+
+def _experience_date_sort_value(date_str: str) -> int:
+    year, month = _parse_experience_date(date_str)
+    return year * 100 + month
+
+
+def _experience_sort_keys(experience: dict) -> dict:
+    return {
+        "sort_end": _experience_date_sort_value(experience.get("end_date", "Present")),
+        "sort_start": _experience_date_sort_value(experience.get("start_date", "")),
+    }
+
+
+def _with_experience_sort_keys(experience: dict) -> dict:
+    """Add the precomputed /experiences sort keys to a document about to be written."""
+    return {**experience, **_experience_sort_keys(experience)}
+
+
+async def _backfill_sort_keys() -> None:
+    """One-time migration for documents written before sort keys existed, plus
+    the compound indexes that let the list endpoints read in order."""
+    # Snapshot before updating so the cursor never revisits rewritten documents.
+    for project in await db.projects.find({"sort_level": {"$exists": False}}).to_list(length=None):
+        await db.projects.update_one({"_id": project["_id"]}, {"$set": _project_sort_keys(project)})
+    for experience in await db.experiences.find({"sort_end": {"$exists": False}}).to_list(length=None):
+        await db.experiences.update_one({"_id": experience["_id"]}, {"$set": _experience_sort_keys(experience)})
+    await db.projects.create_index(PROJECT_SORT)
+    await db.experiences.create_index(EXPERIENCE_SORT)
+
+
+async def _backfill_sort_keys_until_done(retry_interval: float = 30.0) -> None:
+    """Run `_backfill_sort_keys` in the background, retrying until it succeeds.
+
+    Startup doesn't wait on it, so an unreachable Mongo at boot can't hold up
+    /health/live for a server selection timeout. Until it finishes, the list
+    endpoints sort unindexed and may place documents without keys out of order.
+    """
+    while True:
+        try:
+            await _backfill_sort_keys()
+            # bodies cached before the backfill may have that wrong order
+            response_cache.invalidate("projects", "experiences")
+            return
+        except Exception as e:
+            logger.warning(f"Sort key backfill failed, retrying in {retry_interval:.0f}s: {e}")
+            await asyncio.sleep(retry_interval)
+
+
 class Song(BaseModel):
     title: str
     artist: str
     cover_image_url: str
     audio_file_id: str | None = None
+    audio_variants: dict[str, str] | None = None
     spotify_id: str | None = None
 
 
@@ -241,22 +467,115 @@ class ContactInfo(BaseModel):
     github: str
 
 
+# Serializers for cached list bodies; they produce the same JSON FastAPI would
+# for the matching response_model.
+_PROJECTS_JSON = TypeAdapter(list[ProjectResponse])
+_EXPERIENCES_JSON = TypeAdapter(list[ExperienceResponse])
+_CONTACT_JSON = TypeAdapter(ContactInfo)
+_SONGS_JSON = TypeAdapter(list[SongResponse])
+_RESUME_JSON = TypeAdapter(ResumeMetadata)
+
+# FAST_JSON_RESPONSES: projections and optional-field defaults (see app.fast_json)
+_SONG_PROJECTION = model_projection(SongResponse)
+_SONG_DEFAULTS = model_defaults(SongResponse)
+_PROJECT_PROJECTION = model_projection(ProjectResponse)
+_PROJECT_DEFAULTS = model_defaults(ProjectResponse)
+_EXPERIENCE_PROJECTION = model_projection(ExperienceResponse)
+_EXPERIENCE_DEFAULTS = model_defaults(ExperienceResponse)
+
+
+@app.get("/health/live")
+async def liveness_check():
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
 @app.get("/health")
 async def health_check():
-    try:
-        await db.command("ping")
-        return {"status": "healthy", "database": "connected"}
-    except Exception as e:
-        return JSONResponse(status_code=503, content={"status": "unhealthy", "error": str(e)})
+    # answered from the background pinger's last result; never waits on Mongo
+    status = health_monitor.status()
+    if not health_monitor.ready:
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
+async def _get_song_page(collection_name: str, limit: int, after: str | None, seed: int | None) -> list[dict]:
+    """One page of songs in `_id` order, or in the stable order for `seed`."""
+    collection = db[collection_name]
+    seeded = seed is not None
+    if not seeded:
+        query = {}
+        if after:
+            _, after_id = decode_cursor(after, seeded=False)
+            query["_id"] = {"$gt": after_id}
+        return await collection.find(query).sort("_id", 1).limit(limit).to_list(length=limit)
+
+    if collection_name not in _shuffle_keys_backfilled:
+        await backfill_shuffle_keys(collection)
+        _shuffle_keys_backfilled.add(collection_name)
+
+    pipeline: list[dict] = [{"$addFields": {"_order": seeded_order_expr(seed)}}]
+    if after:
+        after_order, after_id = decode_cursor(after, seeded=True)
+        pipeline.append(
+            {"$match": {"$or": [{"_order": {"$gt": after_order}}, {"_order": after_order, "_id": {"$gt": after_id}}]}}
+        )
+    pipeline += [{"$sort": {"_order": 1, "_id": 1}}, {"$limit": limit}]
+    return await collection.aggregate(pipeline).to_list(length=limit)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/diagnostics")
+async def diagnostics():
+    return {
+        "health": health_monitor.status(),
+        "mongo": describe_client(client),
+        "audio_cache": audio_cache.stats(),
+        "search_cache": search_cache.stats(),
+    }
 
 
 @app.get("/songs/{collection_name}", response_model=list[SongResponse])
-async def get_songs(collection_name: str, noshuffle: bool = False):
+async def get_songs(
+    collection_name: str,
+    request: Request,
+    response: Response,
+    noshuffle: bool = False,
+    limit: int | None = Query(None, ge=1, le=MAX_SONG_PAGE_SIZE),
+    after: str | None = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+    seed: int | None = Query(None, description="Page through one stable shuffled order"),
+    sample: int | None = Query(None, ge=1, le=MAX_SONG_PAGE_SIZE, description="Return N random songs"),
+):
     try:
         exists, error_message = await check_collection_exists(collection_name)
         if not exists:
             raise HTTPException(status_code=404, detail=error_message)
 
+        if sample is not None:
+            if FAST_JSON_RESPONSES:
+                pipeline = [{"$sample": {"size": sample}}, {"$project": _SONG_PROJECTION}]
+                songs = await db[collection_name].aggregate(pipeline).to_list(length=sample)
+                return _json_response(dump_documents(songs, _SONG_DEFAULTS), request)
+            cursor = db[collection_name].aggregate([{"$sample": {"size": sample}}])
+            return [_strip_mongo_id(song) async for song in cursor]
+
+        if limit is not None or after is not None or seed is not None:
+            page_size = limit or DEFAULT_SONG_PAGE_SIZE
+            songs = await _get_song_page(collection_name, page_size, after, seed)
+            if len(songs) == page_size:
+                response.headers["X-Next-Cursor"] = encode_cursor(songs[-1], seeded=seed is not None)
+            return [_strip_mongo_id(song) for song in songs]
+
+        if FAST_JSON_RESPONSES:
+            songs = await db[collection_name].find({}, _SONG_PROJECTION).to_list(length=None)
+            if not noshuffle:
+                random.shuffle(songs)
+            return _json_response(dump_documents(songs, _SONG_DEFAULTS), request)
+
         songs = []
         cursor = db[collection_name].find()
         async for song in cursor:
@@ -287,8 +606,26 @@ async def get_song(collection_name: str, song_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to fetch song: {str(e)}")
 
 
+def _select_audio_file_id(song: dict, quality: str | None) -> str:
+    """GridFS id of the rendition to serve for `quality`. Songs ingested before
+    a variant existed (or whose transcode failed) get the original MP3."""
+    if quality is None:
+        return song["audio_file_id"]
+    name = AUDIO_QUALITY_ALIASES.get(quality, quality)
+    if name != "original" and name not in AUDIO_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"Unknown audio quality: {quality}")
+    return (song.get("audio_variants") or {}).get(name) or song["audio_file_id"]
+
+
 @app.get("/songs/{collection_name}/{song_id}/audio")
-async def get_song_audio(collection_name: str, song_id: str):
+async def get_song_audio(
+    collection_name: str,
+    song_id: str,
+    request: Request,
+    quality: str | None = Query(
+        None, description="original, opus96, opus64, or low/medium/high; falls back to the original MP3"
+    ),
+):
     try:
         exists, error_message = await check_collection_exists(collection_name)
         if not exists:
@@ -299,27 +636,106 @@ async def get_song_audio(collection_name: str, song_id: str):
             raise HTTPException(status_code=404, detail="Song has no audio_file_id")
 
         try:
-            audio_file_id = ObjectId(song["audio_file_id"])
+            audio_file_id = ObjectId(_select_audio_file_id(song, quality))
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid audio file id on song")
 
+        grid_file = await _find_grid_file(audio_file_id)
+        if not grid_file:
+            raise HTTPException(status_code=404, detail="Audio file not found")
+
+        # uploads record their type in metadata; "audio/mp3", which MP3s have
+        # always been tagged with, isn't a registered type
+        stored_type = grid_file.get("contentType") or (grid_file.get("metadata") or {}).get("contentType") or ""
+        media_type = stored_type if stored_type.startswith("audio/") and stored_type != "audio/mp3" else "audio/mpeg"
+        length = grid_file["length"]
+        last_modified = grid_file.get("uploadDate")
+        etag = gridfs_etag(audio_file_id, last_modified, length)
+        headers = {
+            "Content-Disposition": "inline",
+            "Accept-Ranges": "bytes",
+            **validator_headers(etag, last_modified, AUDIO_CACHE_CONTROL),
+        }
+
+        # Revalidation never needs the file body, so answer it before opening
+        # a GridFS download stream.
+        if is_not_modified(request.headers, etag, last_modified):
+            return not_modified(headers)
+
+        ranges = []
+        if if_range_matches(request.headers.get("if-range"), etag, last_modified):
+            ranges = parse_range_header(request.headers.get("range"), length)
+
+        # Hot files come from the local disk cache. FileResponse evaluates
+        # Range/If-Range itself against the validators already in `headers`,
+        # so it only gets requests whose Range we'd honour as a single range
+        # (or that have none): it would serve a header we chose to ignore
+        # (malformed, too many ranges, stale If-Range) and gets
+        # multipart/byteranges wrong (Content-Length one byte short). Those are
+        # framed here like the GridFS path does.
+        cached_path = audio_cache.lookup(str(audio_file_id))
+        if cached_path and (len(ranges) == 1 or "range" not in request.headers):
+            return FileResponse(cached_path, media_type=media_type, headers=headers)
+        if cached_path:
+            try:
+                cached_file = await asyncio.to_thread(open, cached_path, "rb")
+            except OSError:
+                cached_file = None  # evicted since the lookup; use GridFS
+            if cached_file is not None:
+                if not ranges:
+                    headers["Content-Length"] = str(length)
+                    return StreamingResponse(
+                        iter_file_range(cached_file, 0, length - 1, close=True),
+                        media_type=media_type,
+                        headers=headers,
+                    )
+                boundary = new_boundary()
+                headers["Content-Length"] = str(multipart_length(ranges, boundary, media_type, length))
+                return StreamingResponse(
+                    iter_file_multipart_ranges(cached_file, length, ranges, boundary, media_type),
+                    status_code=206,
+                    media_type=f"multipart/byteranges; boundary={boundary}",
+                    headers=headers,
+                )
+
         try:
             grid_out = await fs.open_download_stream(audio_file_id)
         except Exception as e:
             logger.error(f"Failed to open GridFS stream for {audio_file_id}: {e}", exc_info=True)
             raise HTTPException(status_code=404, detail="Audio file not found")
 
-        stored_type = getattr(grid_out, "content_type", None) or ""
-        media_type = stored_type if stored_type.startswith("audio/") else "audio/mpeg"
+        # Only a read of the whole file (media elements often ask for
+        # `bytes=0-`) can populate the disk cache.
+        full_read = not ranges or ranges == [(0, length - 1)]
 
         try:
+            if len(ranges) == 1:
+                start, end = ranges[0]
+                headers["Content-Range"] = content_range(start, end, length)
+                headers["Content-Length"] = str(end - start + 1)
+                body = count_gridfs_bytes(iter_grid_range(grid_out, start, end), collection_name)
+                if full_read:
+                    body = audio_cache.fill(str(audio_file_id), body, length)
+                return StreamingResponse(body, status_code=206, media_type=media_type, headers=headers)
+
+            if ranges:
+                boundary = new_boundary()
+                headers["Content-Length"] = str(multipart_length(ranges, boundary, media_type, length))
+                return StreamingResponse(
+                    count_gridfs_bytes(iter_multipart_ranges(grid_out, ranges, boundary, media_type), collection_name),
+                    status_code=206,
+                    media_type=f"multipart/byteranges; boundary={boundary}",
+                    headers=headers,
+                )
+
             # Content-Length lets the browser show real download progress and
             # decode reliably (vs. open-ended chunked transfer).
-            headers = {
-                "Content-Disposition": "inline",
-                "Content-Length": str(grid_out.length),
-            }
-            return StreamingResponse(grid_out, media_type=media_type, headers=headers)
+            headers["Content-Length"] = str(length)
+            return StreamingResponse(
+                audio_cache.fill(str(audio_file_id), count_gridfs_bytes(grid_out, collection_name), length),
+                media_type=media_type,
+                headers=headers,
+            )
         except Exception as e:
             logger.error(f"Failed to stream GridFS file {audio_file_id}: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Failed to stream audio file")
@@ -329,6 +745,65 @@ async def get_song_audio(collection_name: str, song_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to fetch song audio: {str(e)}")
 
 
+async def _get_song_segments(collection_name: str, song_id: str) -> list[dict]:
+    exists, error_message = await check_collection_exists(collection_name)
+    if not exists:
+        raise HTTPException(status_code=404, detail=error_message)
+
+    song = await _fetch_by_object_id(db[collection_name], song_id, "Song not found")
+    segments = (song.get("audio_segments") or {}).get("segments")
+    if not segments:
+        raise HTTPException(status_code=404, detail="Song has no audio segments")
+    return segments
+
+
+@app.get("/songs/{collection_name}/{song_id}/audio/playlist.m3u8")
+async def get_song_audio_playlist(collection_name: str, song_id: str, request: Request):
+    try:
+        segments = await _get_song_segments(collection_name, song_id)
+        # segments are never rewritten in place, so their ids identify the playlist
+        etag = f'"{hashlib.sha256(",".join(s["file_id"] for s in segments).encode()).hexdigest()[:32]}"'
+        headers = validator_headers(etag, None, AUDIO_CACHE_CONTROL)
+        if is_not_modified(request.headers, etag, None):
+            return not_modified(headers)
+        return Response(content=render_playlist(segments), media_type=PLAYLIST_MEDIA_TYPE, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch audio playlist: {str(e)}")
+
+
+@app.get("/songs/{collection_name}/{song_id}/audio/segments/{index}")
+async def get_song_audio_segment(collection_name: str, song_id: str, index: int, request: Request):
+    try:
+        segments = await _get_song_segments(collection_name, song_id)
+        if not 0 <= index < len(segments):
+            raise HTTPException(status_code=404, detail="Audio segment not found")
+
+        segment_id = ObjectId(segments[index]["file_id"])
+        grid_file = await _find_grid_file(segment_id)
+        if not grid_file:
+            raise HTTPException(status_code=404, detail="Audio segment not found")
+
+        length = grid_file["length"]
+        last_modified = grid_file.get("uploadDate")
+        etag = gridfs_etag(segment_id, last_modified, length)
+        headers = validator_headers(etag, last_modified, AUDIO_CACHE_CONTROL)
+        if is_not_modified(request.headers, etag, last_modified):
+            return not_modified(headers)
+
+        # segments are a few seconds each, so they're sent whole
+        grid_out = await fs.open_download_stream(segment_id)
+        headers["Content-Length"] = str(length)
+        return StreamingResponse(
+            count_gridfs_bytes(grid_out, collection_name), media_type=SEGMENT_CONTENT_TYPE, headers=headers
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch audio segment: {str(e)}")
+
+
 @app.delete("/songs/{collection_name}/{song_id}")
 async def delete_song(collection_name: str, song_id: str):
     try:
@@ -338,8 +813,9 @@ async def delete_song(collection_name: str, song_id: str):
 
         song = await _fetch_by_object_id(db[collection_name], song_id, "Song not found")
 
-        if song.get("audio_file_id"):
-            await fs.delete(ObjectId(song["audio_file_id"]))
+        for audio_file_id in song_audio_file_ids(song):
+            await fs.delete(ObjectId(audio_file_id))
+            audio_cache.discard(audio_file_id)
 
         await db[collection_name].delete_one({"_id": ObjectId(song_id)})
         return {"message": "Song deleted successfully"}
@@ -354,37 +830,72 @@ async def get_spotify_playlist(playlist_id: str, collection: str = "study"):
     try:
         # Use the get_spotify_client() function instead of global variable
         spotify_client = get_spotify_client()
-        results = spotify_client.playlist_tracks(playlist_id)
-        tracks = []
-
-        for item in results["items"]:
-            track = item["track"]
-            if track:
-                # check for duplicates in the specified collection
-                existing_song = await db[collection].find_one({"spotify_id": track["id"]})
-                if existing_song:
-                    continue
-
-                # get the first artist
-                artist = track["artists"][0]["name"]
-
-                # get the album cover image
-                cover_image = track["album"]["images"][0]["url"] if track["album"]["images"] else None
-
-                tracks.append(
-                    SpotifyTrack(
-                        title=track["name"], artist=artist, cover_image_url=cover_image, spotify_id=track["id"]
-                    )
-                )
+        collection_ref = db[collection]
+
+        # dedupe each page against the collection (one query per page) while
+        # the remaining pages are still being fetched
+        pages: list[tuple[int, list[SpotifyTrack]]] = []
+        async for offset, playlist_tracks in iter_playlist_tracks(spotify_client, playlist_id):
+            existing = await existing_spotify_ids(collection_ref, [track["id"] for track in playlist_tracks])
+            page = [SpotifyTrack(**track_to_song(track)) for track in playlist_tracks if track["id"] not in existing]
+            pages.append((offset, page))
+
+        # pages arrive out of order; return tracks in playlist order
+        tracks = [track for _, page in sorted(pages, key=lambda p: p[0]) for track in page]
 
         return tracks
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch Spotify playlist: {str(e)}")
 
 
+async def _attach_audio(collection_name: str, song: dict, youtube_url: str, segmented: bool | None = None) -> dict:
+    """Download `youtube_url` and attach it to `song` as its GridFS audio."""
+    try:
+        try:
+            fields = await fetch_and_store_audio(fs, song["title"], youtube_url, segmented)
+        except IngestError:
+            raise HTTPException(status_code=400, detail="Download timed out. Please try again.")
+
+        # update song document with audio file ID
+        await db[collection_name].update_one({"_id": song["_id"]}, {"$set": fields})
+
+        return {"message": "Audio attached successfully"}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to download YouTube audio: {str(e)}")
+
+
+async def _run_attach_audio_job(job: JobContext) -> None:
+    collection_name = job.params["collection_name"]
+    spotify_id = job.params["spotify_id"]
+    await job.add_items({spotify_id: job.params["youtube_url"]})
+
+    song = await db[collection_name].find_one({"spotify_id": spotify_id})
+    if not song:
+        raise Exception("Song not found in collection")
+    if song.get("audio_file_id"):
+        # attached by an earlier run that was interrupted before completing
+        await job.item_done(spotify_id)
+        return
+
+    try:
+        result = await _attach_audio(collection_name, song, job.params["youtube_url"], job.params.get("segmented"))
+    except HTTPException as e:
+        await job.item_done(spotify_id, e.detail)
+        raise Exception(e.detail)
+    await job.item_done(spotify_id)
+    await job.set_result(result)
+
+
 @app.post("/songs/{collection_name}/{spotify_id}/audio")
 async def attach_youtube_audio(
-    collection_name: str, spotify_id: str, youtube_url: str = Query(..., description="YouTube URL for the audio")
+    collection_name: str,
+    spotify_id: str,
+    youtube_url: str = Query(..., description="YouTube URL for the audio"),
+    wait: bool = Query(False, description="Download inside the request instead of queueing a job"),
+    segments: bool | None = Query(None, description="Also store HLS segments (default: INGEST_AUDIO_SEGMENTS)"),
 ):
     try:
         exists, error_message = await check_collection_exists(collection_name)
@@ -399,32 +910,19 @@ async def attach_youtube_audio(
         if song.get("audio_file_id"):
             raise HTTPException(status_code=400, detail="Song already has audio attached")
 
-        executor = ThreadPoolExecutor()
-
-        try:
-            # run the download with timeout
-            try:
-                audio_data = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(executor, download_audio_sync, youtube_url), timeout=60.0
-                )
-            except TimeoutError:
-                raise HTTPException(status_code=400, detail="Download timed out. Please try again.")
-
-            # upload to GridFS
-            filename = f"{song['title']}.mp3"
-            grid_in = await fs.upload_from_stream(
-                filename, io.BytesIO(audio_data), metadata={"contentType": "audio/mp3"}
-            )
-
-            # update song document with audio file ID
-            await db[collection_name].update_one({"_id": song["_id"]}, {"$set": {"audio_file_id": str(grid_in)}})
-
-            return {"message": "Audio attached successfully"}
-
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Failed to download YouTube audio: {str(e)}")
-        finally:
-            executor.shutdown()
+        if wait:
+            return await _attach_audio(collection_name, song, youtube_url, segments)
+
+        job_id = await job_manager.submit(
+            "attach-audio",
+            {
+                "collection_name": collection_name,
+                "spotify_id": spotify_id,
+                "youtube_url": youtube_url,
+                "segmented": segments,
+            },
+        )
+        return JSONResponse(status_code=202, content={"message": "Audio attach queued", "job_id": job_id})
 
     except HTTPException:
         raise
@@ -435,102 +933,96 @@ async def attach_youtube_audio(
 @app.post("/songs/collection/{collection_name}")
 async def add_songs_to_collection(collection_name: str, songs: list[dict[str, Any]]):
     try:
-        result = await db[collection_name].insert_many(songs)
-
-        # convert ObjectIds to strings for JSON serialization
-        inserted_ids = [str(id) for id in result.inserted_ids]
+        collection = db[collection_name]
+        # songs from a Spotify playlist are upserted on spotify_id so that
+        # re-importing one leaves the songs already in the collection alone
+        spotify_songs = [song for song in songs if isinstance(song.get("spotify_id"), str)]
+        other_songs = [song for song in songs if not isinstance(song.get("spotify_id"), str)]
+
+        inserted_count = await upsert_songs(collection, spotify_songs)
+        if other_songs:
+            result = await collection.insert_many([with_shuffle_key(song) for song in other_songs])
+            inserted_count += len(result.inserted_ids)
+        if inserted_count:
+            collection_registry.add(collection_name)
 
         return {
-            "message": f"Added {len(inserted_ids)} songs to collection '{collection_name}'",
+            "message": f"Added {inserted_count} songs to collection '{collection_name}'",
             "collection_name": collection_name,
-            "inserted_count": len(inserted_ids),
+            "inserted_count": inserted_count,
+            "skipped_count": len(songs) - inserted_count,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add songs to collection: {str(e)}")
 
 
-@app.post("/songs/{collection_name}/process-missing")
-async def process_songs_without_audio(collection_name: str):
-    try:
-        exists, error_message = await check_collection_exists(collection_name)
-        if not exists:
-            raise HTTPException(status_code=404, detail=error_message)
+@app.post("/songs/collection/{collection_name}/ndjson")
+async def add_songs_to_collection_ndjson(collection_name: str, request: Request):
+    """Bulk add from a newline-delimited JSON body, one song per line.
 
-        # find all songs without youtube_link or audio_file_id
-        cursor = db[collection_name].find(
-            {"$or": [{"youtube_link": {"$exists": False}}, {"audio_file_id": {"$exists": False}}]}
-        )
+    Lines are inserted in unordered batches as they arrive; bad lines are
+    reported by line number instead of failing the whole request. Songs with
+    a spotify_id already in the collection are skipped, as in the JSON route.
+    """
+    try:
+        collection = db[collection_name]
+        await ensure_spotify_index(collection)
+        result = await insert_ndjson(request.stream(), collection, with_shuffle_key, upsert_key="spotify_id")
+        if result["inserted_count"]:
+            collection_registry.add(collection_name)
 
-        processed_count = 0
-        failed_songs = []
+        return {
+            "message": f"Added {result['inserted_count']} songs to collection '{collection_name}'",
+            "collection_name": collection_name,
+            **result,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to add songs to collection: {str(e)}")
 
-        async for song in cursor:
-            try:
-                # search for the song on YouTube Music
-                search_query = f"{song['title']} {song['artist']}"
 
-                # call YTMusic API to search for the video
-                ytmusic_client = get_ytmusic_client()
-                search_results = ytmusic_client.search(search_query, filter="songs")
+async def _find_songs_missing_audio(collection) -> list[dict]:
+    # find all songs without youtube_link or audio_file_id; snapshot them
+    # first since the pipeline updates these documents concurrently
+    return await collection.find(
+        {"$or": [{"youtube_link": {"$exists": False}}, {"audio_file_id": {"$exists": False}}]}
+    ).to_list(length=None)
 
-                # check if we got any results
-                if not search_results:
-                    failed_songs.append(
-                        {"title": song["title"], "artist": song["artist"], "reason": "No YouTube results found"}
-                    )
-                    continue
-
-                # pick the first result whose title AND artist are close enough;
-                # otherwise skip rather than blindly downloading the wrong upload
-                match = pick_youtube_match(song["title"], song["artist"], search_results)
-                if not match:
-                    top = search_results[0]
-                    top_title = top.get("title") or "?"
-                    top_artist = " ".join(a.get("name", "") for a in (top.get("artists") or [])) or "?"
-                    failed_songs.append(
-                        {
-                            "title": song["title"],
-                            "artist": song["artist"],
-                            "reason": f"No YouTube title+artist match >=0.7 (top: {top_title!r} by {top_artist!r})",
-                        }
-                    )
-                    continue
-                youtube_url = f"https://www.youtube.com/watch?v={match['videoId']}"
 
-                # download the audio using yt-dlp
-                executor = ThreadPoolExecutor()
+async def _run_process_missing_job(job: JobContext) -> None:
+    collection = db[job.params["collection_name"]]
+    songs = [song for song in await _find_songs_missing_audio(collection) if not job.finished(str(song["_id"]))]
+    await job.add_items({str(song["_id"]): f"{song['title']} / {song['artist']}" for song in songs})
 
-                try:
-                    # download with timeout
-                    audio_data = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(executor, download_audio_sync, youtube_url),
-                        timeout=60.0,
-                    )
+    async def on_result(song: dict, reason: str | None) -> None:
+        await job.item_done(str(song["_id"]), reason)
 
-                    # upload to GridFS
-                    filename = f"{song['title']}.mp3"
-                    grid_in = await fs.upload_from_stream(
-                        filename, io.BytesIO(audio_data), metadata={"contentType": "audio/mp3"}
-                    )
+    processed_count, failed_songs = await ingest_songs(
+        collection, fs, get_ytmusic_client, songs, on_result, job.params.get("segmented")
+    )
+    await job.set_result({"processed_count": processed_count, "failed_songs": failed_songs})
 
-                    # update song with youtube_link and audio_file_id
-                    await db[collection_name].update_one(
-                        {"_id": song["_id"]}, {"$set": {"youtube_link": youtube_url, "audio_file_id": str(grid_in)}}
-                    )
 
-                    processed_count += 1
+@app.post("/songs/{collection_name}/process-missing")
+async def process_songs_without_audio(
+    collection_name: str,
+    wait: bool = Query(False, description="Process inside the request instead of queueing a job"),
+    segments: bool | None = Query(None, description="Also store HLS segments (default: INGEST_AUDIO_SEGMENTS)"),
+):
+    try:
+        exists, error_message = await check_collection_exists(collection_name)
+        if not exists:
+            raise HTTPException(status_code=404, detail=error_message)
 
-                except TimeoutError:
-                    failed_songs.append(
-                        {"title": song["title"], "artist": song["artist"], "reason": "Download timeout"}
-                    )
-                except Exception as e:
-                    failed_songs.append({"title": song["title"], "artist": song["artist"], "reason": str(e)})
-                finally:
-                    executor.shutdown()
+        if not wait:
+            job_id = await job_manager.submit(
+                "process-missing", {"collection_name": collection_name, "segmented": segments}
+            )
+            return JSONResponse(status_code=202, content={"message": "Processing queued", "job_id": job_id})
 
-            except Exception as e:
-                failed_songs.append({"title": song["title"], "artist": song["artist"], "reason": str(e)})
+        songs = await _find_songs_missing_audio(db[collection_name])
+        processed_count, failed_songs = await ingest_songs(
+            db[collection_name], fs, get_ytmusic_client, songs, segmented=segments
+        )
 
         return {
             "message": f"Processed {processed_count} songs",
@@ -538,30 +1030,64 @@ async def process_songs_without_audio(collection_name: str):
             "failed_songs": failed_songs,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process songs: {str(e)}")
 
 
+job_manager.register("attach-audio", _run_attach_audio_job)
+job_manager.register("process-missing", _run_process_missing_job)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    try:
+        job = await job_manager.get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch job: {str(e)}")
+
+
 @app.post("/resume/upload", response_model=dict[str, str])
 async def upload_resume(file: UploadFile = File(...)):
     try:
         if not file.content_type == "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
-        content = await file.read()
-
-        grid_in = await fs.upload_from_stream(
-            file.filename, io.BytesIO(content), metadata={"contentType": file.content_type}
-        )
-
-        resume_data = ResumeMetadata(filename=file.filename, file_id=str(grid_in), content_type=file.content_type)
+        # stream into GridFS chunk by chunk; the collected bytes become the
+        # in-memory copy served by /resume/view and /resume/download
+        grid_in = fs.open_upload_stream(file.filename, metadata={"contentType": file.content_type})
+        chunks = []
+        size = 0
+        try:
+            while chunk := await file.read(RESUME_UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > RESUME_MAX_BYTES:
+                    raise HTTPException(status_code=413, detail=f"Resume is larger than {RESUME_MAX_BYTES} bytes")
+                await grid_in.write(chunk)
+                chunks.append(chunk)
+        except BaseException:
+            await grid_in.abort()
+            raise
+        await grid_in.close()
+
+        resume_data = ResumeMetadata(filename=file.filename, file_id=str(grid_in._id), content_type=file.content_type)
 
         await db.resume.delete_many({})
 
-        await db.resume.insert_one(resume_data.dict())
+        resume = resume_data.dict()
+        await db.resume.insert_one(resume)
+        resume_cache.set(resume, b"".join(chunks), grid_in.upload_date)
 
-        return {"message": "Resume uploaded successfully", "file_id": str(grid_in)}
+        return {"message": "Resume uploaded successfully", "file_id": str(grid_in._id)}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload resume: {str(e)}")
 
@@ -569,11 +1095,11 @@ async def upload_resume(file: UploadFile = File(...)):
 @app.get("/resume", response_model=ResumeMetadata | None)
 async def get_resume():
     try:
-        resume = await db.resume.find_one()
+        resume = await resume_cache.get()
         if not resume:
             raise HTTPException(status_code=404, detail="No resume found")
 
-        return _strip_mongo_id(resume)
+        return resume.metadata
 
     except HTTPException:
         raise
@@ -581,16 +1107,30 @@ async def get_resume():
         raise HTTPException(status_code=500, detail=f"Failed to fetch resume: {str(e)}")
 
 
+def _serve_resume(request: Request, resume: CachedResume, disposition: str | None = None) -> Response:
+    """Send the in-memory resume PDF, answering revalidations with 304."""
+    if resume.content is None:
+        raise HTTPException(status_code=404, detail="Resume file not found")
+
+    headers = validator_headers(resume.etag, resume.last_modified, RESUME_CACHE_CONTROL)
+    if disposition:
+        headers["Content-Disposition"] = disposition
+
+    if is_not_modified(request.headers, resume.etag, resume.last_modified):
+        return not_modified(headers)
+
+    # Response sets Content-Length from the bytes
+    return Response(content=resume.content, media_type="application/pdf", headers=headers)
+
+
 @app.get("/resume/view")
-async def view_resume():
+async def view_resume(request: Request):
     try:
-        resume = await db.resume.find_one()
+        resume = await resume_cache.get()
         if not resume:
             raise HTTPException(status_code=404, detail="No resume found")
 
-        grid_out = await fs.open_download_stream(ObjectId(resume["file_id"]))
-
-        return StreamingResponse(grid_out, media_type="application/pdf")
+        return _serve_resume(request, resume)
 
     except HTTPException:
         raise
@@ -599,19 +1139,13 @@ async def view_resume():
 
 
 @app.get("/resume/download")
-async def download_resume():
+async def download_resume(request: Request):
     try:
-        resume = await db.resume.find_one()
+        resume = await resume_cache.get()
         if not resume:
             raise HTTPException(status_code=404, detail="No resume found")
 
-        grid_out = await fs.open_download_stream(ObjectId(resume["file_id"]))
-
-        return StreamingResponse(
-            grid_out,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="{resume["filename"]}"'},
-        )
+        return _serve_resume(request, resume, f'attachment; filename="{resume.metadata["filename"]}"')
 
     except HTTPException:
         raise
@@ -619,25 +1153,111 @@ async def download_resume():
         raise HTTPException(status_code=500, detail=f"Failed to download resume: {str(e)}")
 
 
+async def _load_contact_json() -> bytes:
+    contact = await db.contact.find_one({"_id": "primary"}) or await db.contact.find_one()
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact info not found")
+    return _CONTACT_JSON.dump_json(ContactInfo(**_strip_mongo_id(contact)))
+
+
 @app.get("/contact", response_model=ContactInfo)
-async def get_contact():
+async def get_contact(request: Request):
     try:
-        contact = await db.contact.find_one({"_id": "primary"}) or await db.contact.find_one()
-        if not contact:
-            raise HTTPException(status_code=404, detail="Contact info not found")
-        return ContactInfo(**_strip_mongo_id(contact))
+        body = await response_cache.get_or_load("contact", _load_contact_json)
+        return _json_response(body, request, "contact")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch contact info: {str(e)}")
 
 
+async def _unless_missing(load: Awaitable[bytes | None]) -> bytes | None:
+    """The loaded body, or None where the standalone endpoint would 404."""
+    try:
+        return await load
+    except HTTPException as e:
+        if e.status_code == 404:
+            return None
+        raise
+
+
+async def _load_resume_json() -> bytes | None:
+    resume = await resume_cache.get()
+    return _RESUME_JSON.dump_json(ResumeMetadata(**resume.metadata)) if resume else None
+
+
+async def _load_song_page_json(collection_name: str | None, limit: int) -> bytes | None:
+    """First page of a song collection in `_id` order, with the cursor for the next one."""
+    if not collection_name:
+        return None
+    exists, _ = await check_collection_exists(collection_name)
+    if not exists:
+        return None
+    songs = await _get_song_page(collection_name, limit, None, None)
+    next_cursor = encode_cursor(songs[-1], seeded=False) if len(songs) == limit else None
+    return _json_object(
+        {
+            "collection": to_json(collection_name),
+            "items": _SONGS_JSON.dump_json(_SONGS_JSON.validate_python([_strip_mongo_id(song) for song in songs])),
+            "next_cursor": to_json(next_cursor),
+        }
+    )
+
+
+@app.get("/bootstrap")
+async def get_bootstrap(
+    request: Request,
+    collection: str | None = Query(None, description="Song collection to include the first page of"),
+    song_limit: int = Query(DEFAULT_SONG_PAGE_SIZE, ge=1, le=MAX_SONG_PAGE_SIZE),
+):
+    """Everything the first page load needs, in one response.
+
+    The parts are loaded concurrently (projects, experiences and contact from
+    the response cache), so the request takes as long as the slowest one.
+    Each part has the shape of its standalone endpoint, or null where that
+    endpoint would 404. Songs are the first `_id`-ordered page (see
+    X-Next-Cursor on /songs) rather than a shuffled list, so the payload is
+    stable and revalidates with a single ETag.
+    """
+    try:
+        projects, experiences, contact, resume, songs = await asyncio.gather(
+            response_cache.get_or_load("projects", _load_projects_json),
+            response_cache.get_or_load("experiences", _load_experiences_json),
+            _unless_missing(response_cache.get_or_load("contact", _load_contact_json)),
+            _load_resume_json(),
+            _load_song_page_json(collection, song_limit),
+        )
+        body = _json_object(
+            {
+                "projects": projects,
+                "experiences": experiences,
+                "contact": contact,
+                "resume": resume,
+                "songs": songs,
+            }
+        )
+
+        etag = body_etag(body)
+        headers = {"ETag": etag, "Cache-Control": BOOTSTRAP_CACHE_CONTROL}
+        if is_not_modified(request.headers, etag, None):
+            return not_modified(headers)
+
+        response = _json_response(body, request)
+        response.headers.update(headers)
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load bootstrap data: {str(e)}")
+
+
 @app.post("/projects", response_model=dict[str, str])
 async def add_project(project: Project):
     try:
-        project_dict = project.dict()
+        project_dict = _with_project_sort_keys(project.dict())
 
         result = await db.projects.insert_one(project_dict)
+        response_cache.invalidate("projects")
 
         return {"message": "Project added successfully", "id": str(result.inserted_id)}
     except Exception as e:
@@ -647,9 +1267,10 @@ async def add_project(project: Project):
 @app.post("/projects/bulk", response_model=dict[str, Any])
 async def add_projects(projects: list[Project]):
     try:
-        project_dicts = [project.dict() for project in projects]
+        project_dicts = [_with_project_sort_keys(project.dict()) for project in projects]
 
         result = await db.projects.insert_many(project_dicts)
+        response_cache.invalidate("projects")
 
         inserted_ids = [str(id) for id in result.inserted_ids]
 
@@ -658,17 +1279,32 @@ async def add_projects(projects: list[Project]):
         raise HTTPException(status_code=500, detail=f"Failed to add projects: {str(e)}")
 
 
-@app.get("/projects", response_model=list[ProjectResponse])
-async def get_projects():
+@app.post("/projects/bulk/ndjson", response_model=dict[str, Any])
+async def add_projects_ndjson(request: Request):
     try:
-        projects = []
-        cursor = db.projects.find()
+        result = await insert_ndjson(
+            request.stream(), db.projects, lambda doc: _with_project_sort_keys(Project(**doc).dict())
+        )
+        response_cache.invalidate("projects")
+
+        return {"message": f"Added {result['inserted_count']} projects", **result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to add projects: {str(e)}")
+
+
+async def _load_projects_json() -> bytes:
+    if FAST_JSON_RESPONSES:
+        projects = await db.projects.find({}, _PROJECT_PROJECTION).sort(PROJECT_SORT).to_list(length=None)
+        return dump_documents(projects, _PROJECT_DEFAULTS)
+    projects = [_strip_mongo_id(project) async for project in db.projects.find().sort(PROJECT_SORT)]
+    return _PROJECTS_JSON.dump_json(_PROJECTS_JSON.validate_python(projects))
 
-        async for project in cursor:
-            projects.append(_strip_mongo_id(project))
 
-        projects.sort(key=_project_sort_key)
-        return projects
+@app.get("/projects", response_model=list[ProjectResponse])
+async def get_projects(request: Request):
+    try:
+        body = await response_cache.get_or_load("projects", _load_projects_json)
+        return _json_response(body, request, "projects")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch projects: {str(e)}")
 
@@ -689,7 +1325,10 @@ async def update_project(project_id: str, project: Project):
     try:
         await _fetch_by_object_id(db.projects, project_id, "Project not found")
 
-        update_result = await db.projects.update_one({"_id": ObjectId(project_id)}, {"$set": project.dict()})
+        update_result = await db.projects.update_one(
+            {"_id": ObjectId(project_id)}, {"$set": _with_project_sort_keys(project.dict())}
+        )
+        response_cache.invalidate("projects")
 
         if update_result.modified_count == 0:
             raise HTTPException(status_code=400, detail="Project was not updated")
@@ -708,6 +1347,7 @@ async def delete_project(project_id: str):
         await _fetch_by_object_id(db.projects, project_id, "Project not found")
 
         delete_result = await db.projects.delete_one({"_id": ObjectId(project_id)})
+        response_cache.invalidate("projects")
 
         if delete_result.deleted_count == 0:
             raise HTTPException(status_code=400, detail="Project was not deleted")
@@ -722,9 +1362,10 @@ async def delete_project(project_id: str):
 @app.post("/experiences", response_model=dict[str, str])
 async def add_experience(experience: Experience):
     try:
-        experience_dict = experience.dict()
+        experience_dict = _with_experience_sort_keys(experience.dict())
 
         result = await db.experiences.insert_one(experience_dict)
+        response_cache.invalidate("experiences")
 
         return {"message": "Experience added successfully", "id": str(result.inserted_id)}
     except Exception as e:
@@ -734,9 +1375,10 @@ async def add_experience(experience: Experience):
 @app.post("/experiences/bulk", response_model=dict[str, Any])
 async def add_experiences(experiences: list[Experience]):
     try:
-        experience_dicts = [experience.dict() for experience in experiences]
+        experience_dicts = [_with_experience_sort_keys(experience.dict()) for experience in experiences]
 
         result = await db.experiences.insert_many(experience_dicts)
+        response_cache.invalidate("experiences")
 
         inserted_ids = [str(id) for id in result.inserted_ids]
 
@@ -745,25 +1387,32 @@ async def add_experiences(experiences: list[Experience]):
         raise HTTPException(status_code=500, detail=f"Failed to add experiences: {str(e)}")
 
 
-@app.get("/experiences", response_model=list[ExperienceResponse])
-async def get_experiences():
+@app.post("/experiences/bulk/ndjson", response_model=dict[str, Any])
+async def add_experiences_ndjson(request: Request):
     try:
-        experiences = []
-        cursor = db.experiences.find()
+        result = await insert_ndjson(
+            request.stream(), db.experiences, lambda doc: _with_experience_sort_keys(Experience(**doc).dict())
+        )
+        response_cache.invalidate("experiences")
 
-        async for experience in cursor:
-            experiences.append(_strip_mongo_id(experience))
+        return {"message": f"Added {result['inserted_count']} experiences", **result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to add experiences: {str(e)}")
+
+
+async def _load_experiences_json() -> bytes:
+    if FAST_JSON_RESPONSES:
+        experiences = await db.experiences.find({}, _EXPERIENCE_PROJECTION).sort(EXPERIENCE_SORT).to_list(length=None)
+        return dump_documents(experiences, _EXPERIENCE_DEFAULTS)
+    experiences = [_strip_mongo_id(experience) async for experience in db.experiences.find().sort(EXPERIENCE_SORT)]
+    return _EXPERIENCES_JSON.dump_json(_EXPERIENCES_JSON.validate_python(experiences))
 
-        # Sort by end_date descending, then by start_date descending
-        experiences.sort(
-            key=lambda x: (
-                _parse_experience_date(x.get("end_date", "Present")),
-                _parse_experience_date(x.get("start_date", "")),
-            ),
-            reverse=True,
-        )
 
-        return experiences
+@app.get("/experiences", response_model=list[ExperienceResponse])
+async def get_experiences(request: Request):
+    try:
+        body = await response_cache.get_or_load("experiences", _load_experiences_json)
+        return _json_response(body, request, "experiences")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch experiences: {str(e)}")
 
@@ -784,7 +1433,10 @@ async def update_experience(experience_id: str, experience: Experience):
     try:
         await _fetch_by_object_id(db.experiences, experience_id, "Experience not found")
 
-        update_result = await db.experiences.update_one({"_id": ObjectId(experience_id)}, {"$set": experience.dict()})
+        update_result = await db.experiences.update_one(
+            {"_id": ObjectId(experience_id)}, {"$set": _with_experience_sort_keys(experience.dict())}
+        )
+        response_cache.invalidate("experiences")
 
         if update_result.modified_count == 0:
             raise HTTPException(status_code=400, detail="Experience was not updated")
@@ -803,6 +1455,7 @@ async def delete_experience(experience_id: str):
         await _fetch_by_object_id(db.experiences, experience_id, "Experience not found")
 
         delete_result = await db.experiences.delete_one({"_id": ObjectId(experience_id)})
+        response_cache.invalidate("experiences")
 
         if delete_result.deleted_count == 0:
             raise HTTPException(status_code=400, detail="Experience was not deleted")
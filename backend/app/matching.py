@@ -0,0 +1,130 @@
+"""Fuzzy matching of a Spotify song against YouTube Music search results.
+
+Strings are normalized once (accents, case, punctuation, "feat." credits and
+remaster/"official video" tags) and cached, since the same artist names come
+back in result after result. Each candidate then goes through cheap upper
+bounds on `SequenceMatcher.ratio()` (length, then shared characters) before
+the real ratio is computed, and the query side of the matcher is built once
+per song rather than once per comparison.
+
+All candidates are scored and the best one wins, instead of the first one
+over the threshold, so a close cover listed above the original no longer
+shadows it.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import NamedTuple
+
+MATCH_THRESHOLD = 0.7
+
+# Bracketed tags that describe the upload rather than the recording. Live,
+# remix, acoustic etc. are deliberately kept: those are different recordings.
+_NOISE_TAG = re.compile(
+    r"[(\[][^)\]]*\b(feat|ft|featuring|with|remaster(ed)?|official|audio|video|lyrics?|visuali[sz]er|explicit"
+    r"|clean|hq|hd|mono|stereo)\b[^)\]]*[)\]]"
+)
+# "Song - Remastered 2011", "Song - 2009 Remaster", "Song - Single Version"
+_NOISE_SUFFIX = re.compile(r"\s-\s[^-]*\b(remaster(ed)?|single version|album version|mono|stereo)\b.*$")
+_FEATURING = re.compile(r"\s(feat|ft|featuring)\b.*$")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+class Normalized(NamedTuple):
+    text: str
+    tokens: tuple[str, ...]  # sorted, for order-insensitive comparison
+
+
+@lru_cache(maxsize=8192)
+def normalize(value: str) -> Normalized:
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(ch for ch in value if not unicodedata.combining(ch)).casefold()
+    value = _NOISE_TAG.sub(" ", value)
+    value = _NOISE_SUFFIX.sub("", value)
+    value = _FEATURING.sub("", value)
+    value = value.replace("&", " and ")
+    tokens = _NON_WORD.sub(" ", value).split()
+    return Normalized(" ".join(tokens), tuple(sorted(tokens)))
+
+
+class _Field:
+    """One side of a comparison (the song's title or artist), prepared once."""
+
+    def __init__(self, value: str):
+        self.normalized = normalize(value)
+        # SequenceMatcher caches its analysis of seq2, so keep the query there
+        # and swap candidates in as seq1.
+        self._matcher = SequenceMatcher(None, "", self.normalized.text, autojunk=False)
+
+    def score(self, candidate: Normalized, threshold: float) -> float:
+        """Similarity in [0, 1], or 0.0 if it certainly falls below `threshold`."""
+        if candidate.text == self.normalized.text or candidate.tokens == self.normalized.tokens:
+            return 1.0
+        if not candidate.text:
+            return 0.0
+        self._matcher.set_seq1(candidate.text)
+        if self._matcher.real_quick_ratio() < threshold or self._matcher.quick_ratio() < threshold:
+            return 0.0
+        return self._matcher.ratio()
+
+
+def _artist_names(result: dict) -> list[str]:
+    return [a.get("name", "") for a in (result.get("artists") or []) if a.get("name")]
+
+
+def rank_youtube_matches(
+    title: str,
+    artist: str,
+    results: list,
+    threshold: float = MATCH_THRESHOLD,
+) -> list[tuple[float, dict]]:
+    """Score every search result and return `(score, result)` for those whose
+    title AND artist both clear `threshold`, best first.
+
+    The score is the mean of the title and artist similarities. The artist is
+    compared against each credited artist and against all of them joined,
+    since Spotify gives us only the first artist. Ties keep search order.
+    """
+    if not title or not artist or not results:
+        return []
+    title_field = _Field(title)
+    artist_field = _Field(artist)
+    if not title_field.normalized.text or not artist_field.normalized.text:
+        return []
+
+    ranked = []
+    for index, result in enumerate(results):
+        result_title = result.get("title") or ""
+        names = _artist_names(result)
+        if not result_title or not names:
+            continue
+        title_score = title_field.score(normalize(result_title), threshold)
+        if title_score < threshold:
+            continue
+        candidates = names if len(names) == 1 else [" ".join(names), *names]
+        artist_score = max(artist_field.score(normalize(name), threshold) for name in candidates)
+        if artist_score < threshold:
+            continue
+        ranked.append(((title_score + artist_score) / 2, index, result))
+    ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [(score, result) for score, _, result in ranked]
+
+
+def pick_youtube_match(
+    title: str,
+    artist: str,
+    results: list,
+    threshold: float = MATCH_THRESHOLD,
+) -> dict | None:
+    """Pick the ytmusicapi search result that best matches the song.
+
+    Both the title and the artist must be similar enough; requiring both
+    prevents picking the wrong upload when the title is generic (e.g. "Who
+    Knows" by a different artist). Returns None if no result clears both
+    bars; the caller should treat that as a failure rather than blindly
+    downloading the top result.
+    """
+    ranked = rank_youtube_matches(title, artist, results, threshold)
+    return ranked[0][1] if ranked else None
@@ -0,0 +1,254 @@
+"""Prometheus metrics without a client library dependency.
+
+`GET /metrics` renders everything registered here in the Prometheus text
+exposition format. What is measured, and where:
+
+  * HTTP requests: count, latency histogram and in-flight gauge, labelled by
+    route template (`/songs/{collection_name}/{song_id}/audio`, not the raw
+    path, to keep cardinality bounded) - `MetricsMiddleware`.
+  * Mongo commands: duration histogram by command name - `MongoCommandListener`,
+    registered on the Motor client.
+  * GridFS bytes streamed to clients, per collection - `count_gridfs_bytes`.
+  * yt-dlp download durations by outcome - observed in `app.ingest`.
+  * Event loop lag: how late a periodic sleep wakes up - `monitor_event_loop`.
+
+Together these separate a slow Mongo from slow GridFS chunk reads from a
+blocked event loop. pymongo invokes command listeners from its own threads,
+so every metric guards its samples with a lock.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Sample lines, called with the lock held."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines += self._samples()
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {} if labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        # per label set: [count per bucket (not cumulative)..., sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts = self._values.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            counts[-1] += value
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, counts in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=False):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests handled, by route template and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response body was fully sent.",
+    ("method", "route"),
+)
+http_requests_in_progress = Gauge("http_requests_in_progress", "HTTP requests currently being handled.")
+mongodb_command_duration_seconds = Histogram(
+    "mongodb_command_duration_seconds", "Mongo command round-trip time, by command name.", ("command", "outcome")
+)
+gridfs_bytes_streamed_total = Counter(
+    "gridfs_bytes_streamed_total", "Bytes read from GridFS and sent to clients, per collection.", ("collection",)
+)
+ytdlp_download_duration_seconds = Histogram(
+    "ytdlp_download_duration_seconds",
+    "yt-dlp download time per song, by outcome.",
+    ("outcome",),
+    buckets=(1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120),
+)
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a periodic wakeup; high values mean blocking code on the loop.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count, latency and in-flight requests.
+
+    The route template is read from the scope after routing, so it is only
+    known once the request has been handled; unmatched paths (404s for random
+    URLs) are grouped under one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        http_requests_in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_progress.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_requests_total.inc(method=scope["method"], route=route, status=status)
+            http_request_duration_seconds.observe(elapsed, method=scope["method"], route=route)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Records the duration pymongo reports for every command."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        mongodb_command_duration_seconds.observe(event.duration_micros / 1e6, command=event.command_name, outcome="ok")
+
+    def failed(self, event):
+        mongodb_command_duration_seconds.observe(
+            event.duration_micros / 1e6, command=event.command_name, outcome="error"
+        )
+
+
+async def count_gridfs_bytes(chunks: AsyncIterator[bytes], collection: str) -> AsyncIterator[bytes]:
+    """Pass GridFS chunks through, counting the bytes sent for `collection`."""
+    async for chunk in chunks:
+        gridfs_bytes_streamed_total.inc(len(chunk), collection=collection)
+        yield chunk
+
+
+async def monitor_event_loop(interval: float = 0.5) -> None:
+    """Run forever, observing how late each `interval` sleep wakes up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        event_loop_lag_seconds.observe(max(0.0, loop.time() - start - interval))
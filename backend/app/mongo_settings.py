@@ -0,0 +1,54 @@
+"""Motor client options read from the environment.
+
+Every option is optional; anything unset keeps pymongo's default, so an
+empty environment behaves exactly like `AsyncIOMotorClient(MONGODB_URL)`.
+
+    MONGODB_MAX_POOL_SIZE                 connections per server (pymongo: 100)
+    MONGODB_MIN_POOL_SIZE                 connections kept open when idle (pymongo: 0)
+    MONGODB_MAX_IDLE_TIME_MS              close pooled connections idle this long (pymongo: never)
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS   how long to wait for a usable server (pymongo: 30000)
+    MONGODB_CONNECT_TIMEOUT_MS            TCP connect timeout (pymongo: 20000)
+    MONGODB_COMPRESSORS                   wire compression, e.g. "zstd,snappy,zlib"
+
+zlib works out of the box; zstd and snappy need extra packages (see
+pymongo's compression docs). pymongo warns and skips a compressor whose
+package is missing, and the server picks the first listed one it supports.
+"""
+
+import os
+
+_INT_OPTIONS = {
+    "MONGODB_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGODB_MIN_POOL_SIZE": "minPoolSize",
+    "MONGODB_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGODB_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGODB_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+}
+
+
+def mongo_client_options() -> dict:
+    """Keyword arguments for `AsyncIOMotorClient`, from the environment."""
+    options: dict = {}
+    for env_name, option in _INT_OPTIONS.items():
+        value = os.getenv(env_name)
+        if value:
+            options[option] = int(value)
+    compressors = os.getenv("MONGODB_COMPRESSORS")
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def describe_client(client) -> dict:
+    """Effective pool/timeout/compression settings of a client, for diagnostics."""
+    options = client.options
+    pool = options.pool_options
+    return {
+        "max_pool_size": pool.max_pool_size,
+        "min_pool_size": pool.min_pool_size,
+        "max_idle_time_seconds": pool.max_idle_time_seconds,
+        "connect_timeout_seconds": pool.connect_timeout,
+        "server_selection_timeout_seconds": options.server_selection_timeout,
+        # what's left after pymongo dropped compressors it can't load
+        "compressors": list(getattr(getattr(pool, "_compression_settings", None), "compressors", None) or []),
+    }
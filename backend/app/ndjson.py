@@ -0,0 +1,140 @@
+"""Streaming NDJSON bulk inserts.
+
+The JSON-array bulk endpoints parse the whole body, build every document and
+run one ordered `insert_many`, so memory grows with the import and the first
+bad document stops the rest. The NDJSON variants read the request body as
+it arrives, one document per line, and insert in fixed-size `ordered=False`
+batches: memory stays flat (one batch plus one partial line), and a line
+that fails to parse, validate or insert is reported by line number while
+every other line still goes in.
+
+With `upsert_key`, documents that have a string value for that field are
+written as `$setOnInsert` upserts on it instead, so re-sending a line whose
+document already exists leaves it untouched (reported as skipped).
+"""
+
+import json
+import os
+from collections.abc import AsyncIterator, Callable
+
+from pydantic import ValidationError
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+NDJSON_BATCH_SIZE = int(os.getenv("NDJSON_BATCH_SIZE", "500"))
+MAX_LINE_BYTES = 1024 * 1024
+# a 50k-line import of garbage shouldn't produce a 50k-entry response
+MAX_REPORTED_ERRORS = 100
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Yield `(line number, line)` for each non-blank line; `line` is None
+    when it was longer than MAX_LINE_BYTES (its bytes are discarded)."""
+    buffer = b""
+    line_number = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1 :]
+            line_number += 1
+            if oversized:
+                oversized = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+        if len(buffer) > MAX_LINE_BYTES:
+            oversized = True
+            buffer = b""
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'document'}: {e['msg']}" for e in error.errors())
+    return str(error)
+
+
+class _Report:
+    def __init__(self):
+        self.received = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+
+def _write(doc: dict, upsert_key: str | None):
+    if upsert_key is not None and isinstance(doc.get(upsert_key), str):
+        return UpdateOne({upsert_key: doc[upsert_key]}, {"$setOnInsert": doc}, upsert=True)
+    return InsertOne(doc)
+
+
+async def _flush(collection, batch: list[tuple[int, dict]], report: _Report, upsert_key: str | None) -> None:
+    if not batch:
+        return
+    try:
+        result = await collection.bulk_write([_write(doc, upsert_key) for _, doc in batch], ordered=False)
+        report.inserted += result.inserted_count + result.upserted_count
+        report.skipped += result.matched_count
+    except BulkWriteError as e:
+        report.inserted += e.details.get("nInserted", 0) + e.details.get("nUpserted", 0)
+        report.skipped += e.details.get("nMatched", 0)
+        for write_error in e.details.get("writeErrors", []):
+            report.error(batch[write_error["index"]][0], write_error.get("errmsg", "Insert failed"))
+
+
+async def insert_ndjson(
+    chunks: AsyncIterator[bytes],
+    collection,
+    prepare: Callable[[dict], dict],
+    batch_size: int = NDJSON_BATCH_SIZE,
+    upsert_key: str | None = None,
+) -> dict:
+    """Insert every line of an NDJSON body into `collection`.
+
+    `prepare` turns a parsed JSON object into the document to insert and
+    raises (e.g. a pydantic ValidationError) to reject the line. Returns the
+    received, inserted, skipped (already present by `upsert_key`) and failed
+    counts plus the first MAX_REPORTED_ERRORS
+    per-line errors.
+    """
+    report = _Report()
+    batch: list[tuple[int, dict]] = []
+    async for line_number, line in iter_lines(chunks):
+        report.received += 1
+        if line is None:
+            report.error(line_number, f"Line longer than {MAX_LINE_BYTES} bytes")
+            continue
+        try:
+            value = json.loads(line)
+            if not isinstance(value, dict):
+                raise ValueError("Expected a JSON object")
+            batch.append((line_number, prepare(value)))
+        except Exception as e:
+            report.error(line_number, _describe(e))
+            continue
+        if len(batch) >= batch_size:
+            await _flush(collection, batch, report, upsert_key)
+            batch = []
+    await _flush(collection, batch, report, upsert_key)
+
+    return {
+        "received": report.received,
+        "inserted_count": report.inserted,
+        "skipped_count": report.skipped,
+        "failed_count": report.failed,
+        "errors": report.errors,
+        "errors_truncated": report.failed > len(report.errors),
+    }
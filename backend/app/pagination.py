@@ -0,0 +1,62 @@
+"""Cursor pagination and seeded shuffling for song listings.
+
+Every song document carries a random integer `shuffle_key` in
+[0, SHUFFLE_MODULUS). A seed turns those keys into a stable permutation with
+the affine map `(key * multiplier + offset) mod SHUFFLE_MODULUS`, which is a
+bijection because the modulus is prime and the multiplier is never zero.
+Mongo evaluates the map and sorts on it, so a client can page through one
+random order with `limit`/`after` without the server ever holding more than
+a page in memory, and a different seed gives a different order.
+"""
+
+import random
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+SHUFFLE_MODULUS = 2_147_483_647  # 2**31 - 1, prime
+
+
+def new_shuffle_key() -> int:
+    return random.randrange(SHUFFLE_MODULUS)
+
+
+def with_shuffle_key(song: dict) -> dict:
+    """Give a song document about to be inserted its `shuffle_key`."""
+    song.setdefault("shuffle_key", new_shuffle_key())
+    return song
+
+
+async def backfill_shuffle_keys(collection) -> int:
+    """Assign a `shuffle_key` to documents inserted before keys existed."""
+    result = await collection.update_many(
+        {"shuffle_key": {"$exists": False}},
+        [{"$set": {"shuffle_key": {"$toInt": {"$floor": {"$multiply": [{"$rand": {}}, SHUFFLE_MODULUS]}}}}}],
+    )
+    return result.modified_count
+
+
+def seeded_order_expr(seed: int) -> dict:
+    """Aggregation expression mapping `shuffle_key` to its position for `seed`."""
+    multiplier = seed % (SHUFFLE_MODULUS - 1) + 1
+    offset = seed % SHUFFLE_MODULUS
+    return {
+        "$mod": [
+            {"$add": [{"$multiply": [{"$ifNull": ["$shuffle_key", 0]}, multiplier]}, offset]},
+            SHUFFLE_MODULUS,
+        ]
+    }
+
+
+def encode_cursor(song: dict, seeded: bool) -> str:
+    """Opaque-enough cursor for the page after `song` (a raw Mongo document)."""
+    if seeded:
+        return f"{int(song['_order'])}:{song['_id']}"
+    return str(song["_id"])
+
+
+def decode_cursor(cursor: str, seeded: bool) -> tuple[int | None, ObjectId]:
+    order_str, _, id_str = cursor.rpartition(":")
+    if seeded != bool(order_str) or not ObjectId.is_valid(id_str) or (order_str and not order_str.isdigit()):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return (int(order_str) if order_str else None), ObjectId(id_str)
@@ -0,0 +1,213 @@
+"""HTTP byte-range helpers (RFC 9110 section 14) for streaming GridFS files.
+
+Browsers issue `Range` requests for every seek, and Safari/iOS probe audio
+with `Range: bytes=0-1` before playing. Serving those from the start of the
+file means re-reading every GridFS chunk up to the requested offset, so these
+helpers seek the GridFS stream first and only read the chunks a range covers.
+The same multipart framing is used for files in the local audio cache.
+"""
+
+import asyncio
+import secrets
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from functools import partial
+
+from fastapi import HTTPException
+
+# A client asking for more ranges than this is either broken or abusive;
+# serving the whole file is cheaper than building a huge multipart body.
+MAX_RANGES = 16
+
+
+def parse_range_header(header: str | None, length: int) -> list[tuple[int, int]]:
+    """Parse a `Range` header into sorted, coalesced, inclusive (start, end) pairs.
+
+    Returns an empty list when the header is missing, malformed, uses a unit
+    other than bytes, or asks for too many ranges. Per RFC 9110 the caller
+    should then ignore it and send the full representation.
+
+    Raises a 416 HTTPException (with the required `Content-Range: bytes */N`
+    header) when the header is valid but no range overlaps the file.
+    """
+    if not header:
+        return []
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return []
+
+    ranges: list[tuple[int, int]] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        first, last = first.strip(), last.strip()
+        if not sep or not (first or last):
+            return []
+        if (first and not first.isdigit()) or (last and not last.isdigit()):
+            return []
+        if not first:
+            # suffix range: the last N bytes
+            suffix = int(last)
+            if suffix > 0 and length > 0:
+                ranges.append((max(length - suffix, 0), length - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return []
+        if start >= length:
+            continue
+        end = min(int(last), length - 1) if last else length - 1
+        ranges.append((start, end))
+
+    if not ranges or length == 0:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{length}"},
+        )
+
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        prev_start, prev_end = merged[-1]
+        if start <= prev_end + 1:
+            merged[-1] = (prev_start, max(prev_end, end))
+        else:
+            merged.append((start, end))
+
+    if len(merged) > MAX_RANGES:
+        return []
+    return merged
+
+
+def if_range_matches(if_range: str | None, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate an `If-Range` precondition.
+
+    A missing header always matches. An entity-tag must match strongly (weak
+    tags never do); an HTTP-date must equal `last_modified` to the second.
+    When this returns False the caller must ignore `Range` and send 200.
+    """
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == etag
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_range)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return int(since.timestamp()) == int(as_utc(last_modified).timestamp())
+
+
+def as_utc(value: datetime) -> datetime:
+    """GridFS stores naive UTC datetimes; make them timezone-aware."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def content_range(start: int, end: int, length: int) -> str:
+    return f"bytes {start}-{end}/{length}"
+
+
+def new_boundary() -> str:
+    return secrets.token_hex(16)
+
+
+def _part_header(boundary: str, media_type: str, start: int, end: int, length: int) -> bytes:
+    return (
+        f"--{boundary}\r\nContent-Type: {media_type}\r\nContent-Range: {content_range(start, end, length)}\r\n\r\n"
+    ).encode("latin-1")
+
+
+def _closing_delimiter(boundary: str) -> bytes:
+    return f"--{boundary}--\r\n".encode("latin-1")
+
+
+def multipart_length(ranges: list[tuple[int, int]], boundary: str, media_type: str, length: int) -> int:
+    """Exact byte size of the `multipart/byteranges` body for `ranges`."""
+    total = len(_closing_delimiter(boundary))
+    for start, end in ranges:
+        # part header + payload + CRLF terminating the payload
+        total += len(_part_header(boundary, media_type, start, end, length)) + (end - start + 1) + 2
+    return total
+
+
+async def iter_grid_range(grid_out, start: int, end: int) -> AsyncIterator[bytes]:
+    """Yield bytes `start..end` (inclusive) of a Motor GridOut.
+
+    Seeking first makes GridFS resume from chunk `start // chunk_size`, so
+    none of the chunks before the range are fetched from Mongo.
+    """
+    grid_out.seek(start)
+    remaining = end - start + 1
+    chunk_size = grid_out.chunk_size or 255 * 1024
+    while remaining > 0:
+        chunk = await grid_out.read(min(remaining, chunk_size))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+FILE_READ_SIZE = 256 * 1024
+
+
+async def iter_file_range(file, start: int, end: int, close: bool = False) -> AsyncIterator[bytes]:
+    """Yield bytes `start..end` (inclusive) of an open binary file, reading off the event loop.
+
+    With `close`, the file is closed once the range is read or the consumer stops.
+    """
+    try:
+        await asyncio.to_thread(file.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(file.read, min(remaining, FILE_READ_SIZE))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        if close:
+            file.close()
+
+
+async def _iter_multipart(
+    read_range: Callable[[int, int], AsyncIterator[bytes]],
+    ranges: list[tuple[int, int]],
+    boundary: str,
+    media_type: str,
+    length: int,
+) -> AsyncIterator[bytes]:
+    for start, end in ranges:
+        yield _part_header(boundary, media_type, start, end, length)
+        async for chunk in read_range(start, end):
+            yield chunk
+        yield b"\r\n"
+    yield _closing_delimiter(boundary)
+
+
+async def iter_multipart_ranges(
+    grid_out, ranges: list[tuple[int, int]], boundary: str, media_type: str
+) -> AsyncIterator[bytes]:
+    """Yield a `multipart/byteranges` body covering each range in order."""
+    async for part in _iter_multipart(
+        partial(iter_grid_range, grid_out), ranges, boundary, media_type, grid_out.length
+    ):
+        yield part
+
+
+async def iter_file_multipart_ranges(
+    file, length: int, ranges: list[tuple[int, int]], boundary: str, media_type: str
+) -> AsyncIterator[bytes]:
+    """`iter_multipart_ranges` for an open local file of `length` bytes; closes it when done."""
+    try:
+        async for part in _iter_multipart(partial(iter_file_range, file), ranges, boundary, media_type, length):
+            yield part
+    finally:
+        file.close()
@@ -0,0 +1,112 @@
+"""Read-through cache for serialized JSON response bodies.
+
+The portfolio list endpoints are read on every page view but only change
+when one of the write handlers in `app.main` runs, so their fully serialized
+bodies are kept in memory. Entries expire after a TTL (to pick up writes made
+outside this process), the cache is bounded in size with LRU eviction, and
+concurrent misses for the same key share a single load. Derived forms of a
+body (its gzip/brotli encodings) are stored on the entry and dropped with it.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    body: bytes
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 128, ttl: float = 300.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Bumped on invalidation so a load that started before a write never
+        # stores the pre-write body.
+        self._generation = 0
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.body
+
+    def _store(self, key: str, body: bytes) -> None:
+        self._entries[key] = _Entry(time.monotonic() + self._ttl, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Return the cached body for `key`, calling `loader` once on a miss.
+
+        Callers that miss while a load is already running await that load
+        instead of starting their own. Exceptions are propagated to every
+        waiter and never cached.
+        """
+        body = self.get(key)
+        if body is not None:
+            return body
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            body = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark retrieved so an unawaited failure doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(body)
+            if generation == self._generation:
+                self._store(key, body)
+            return body
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def variant(self, key: str, body: bytes, name: str, build: Callable[[bytes], bytes]) -> bytes:
+        """`build(body)`, computed once per cache entry and reused afterwards.
+
+        Only memoized while `body` is still the cached body for `key`; a body
+        that was reloaded or invalidated in the meantime is built uncached.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.body is not body:
+            return build(body)
+        derived = entry.variants.get(name)
+        if derived is None:
+            derived = entry.variants[name] = build(body)
+        return derived
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop `keys` after a write so the next read reloads them."""
+        self._generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()
@@ -0,0 +1,122 @@
+"""In-process copy of the current resume PDF.
+
+The resume link is one of the most clicked assets, and serving it from
+GridFS costs a `db.resume` lookup, an `fs.files` lookup and a chunk download
+on every hit. The resume is small and only changes on upload, so the
+current one is kept here as immutable bytes along with its metadata and
+validators:
+
+  * the first request loads it (once, however many arrive together);
+  * an upload through this process replaces it directly, without reading
+    it back from GridFS;
+  * a background task re-reads `db.resume` every TTL to pick up uploads
+    handled by another process, downloading the PDF only when its file id
+    changed.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from bson import ObjectId
+from gridfs.errors import NoFile
+
+from app.conditional import gridfs_etag
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedResume:
+    metadata: dict  # the db.resume document, with `_id` as a string `id`
+    content: bytes | None  # None when the GridFS file is missing
+    etag: str | None
+    last_modified: datetime | None
+
+
+def _metadata(resume: dict) -> dict:
+    return {**{k: v for k, v in resume.items() if k != "_id"}, "id": str(resume["_id"])}
+
+
+class ResumeCache:
+    def __init__(self, db, fs, ttl: float = 300.0):
+        self._db = db
+        self._fs = fs
+        self._ttl = ttl
+        self._resume: CachedResume | None = None
+        self._loaded_at: float | None = None
+        # Bumped by set() so a refresh that read db.resume before an upload
+        # never replaces the newly uploaded resume with the old one.
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def refresh(self) -> None:
+        generation = self._generation
+        current = self._resume
+        resume = await self._db.resume.find_one()
+        if resume is None:
+            loaded = None
+        elif current is None or current.metadata.get("file_id") != resume["file_id"]:
+            file_id = ObjectId(resume["file_id"])
+            try:
+                grid_out = await self._fs.open_download_stream(file_id)
+            except NoFile:
+                loaded = CachedResume(_metadata(resume), None, None, None)
+            else:
+                content = await grid_out.read()
+                loaded = CachedResume(
+                    metadata=_metadata(resume),
+                    content=content,
+                    etag=gridfs_etag(file_id, grid_out.upload_date, len(content)),
+                    last_modified=grid_out.upload_date,
+                )
+        else:
+            # same file, but the metadata may have been edited
+            loaded = CachedResume(_metadata(resume), current.content, current.etag, current.last_modified)
+        if generation == self._generation:
+            self._resume = loaded
+            self._loaded_at = time.monotonic()
+
+    async def get(self) -> CachedResume | None:
+        """The current resume, or None if there is none."""
+        if self._loaded_at is None:
+            async with self._lock:
+                # another request may have loaded it while we waited on the lock
+                if self._loaded_at is None:
+                    await self.refresh()
+        return self._resume
+
+    def set(self, resume: dict, content: bytes, upload_date: datetime | None) -> None:
+        """Replace the cached resume after this process uploaded `content`."""
+        file_id = ObjectId(resume["file_id"])
+        self._generation += 1
+        self._resume = CachedResume(
+            metadata=_metadata(resume),
+            content=content,
+            etag=gridfs_etag(file_id, upload_date, len(content)),
+            last_modified=upload_date,
+        )
+        self._loaded_at = time.monotonic()
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._ttl)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Background resume refresh failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -0,0 +1,117 @@
+"""Persistent cache of YouTube Music search results, shared across runs.
+
+Every sync run and every `/process-missing` call searches YouTube Music for
+each song still missing audio, including the ones that failed to match last
+time. This caches the raw search results in a small SQLite file, keyed by the
+normalized title and artist, so a rerun after a partial failure only searches
+for new songs. The matcher still runs on cached results, so matcher fixes
+apply without purging.
+
+Results that produced no match are cached too, but with a shorter TTL, so a
+song YouTube doesn't have yet is retried eventually rather than never.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.matching import normalize
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", str(BACKEND_ROOT / "search_cache.sqlite3"))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", str(30 * 24 * 3600)))
+SEARCH_CACHE_NEGATIVE_TTL = int(os.getenv("SEARCH_CACHE_NEGATIVE_TTL", str(24 * 3600)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    query TEXT PRIMARY KEY,
+    results TEXT NOT NULL,
+    matched INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+def cache_key(title: str, artist: str) -> str:
+    return f"{normalize(title).text}\x1f{normalize(artist).text}"
+
+
+class SearchCache:
+    """Thread-safe: the ingest pipeline searches from several executor threads."""
+
+    def __init__(self, path: str, ttl: int, negative_ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.enabled = ttl > 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    def get(self, title: str, artist: str) -> list | None:
+        """Cached search results for the song, or None if absent or expired."""
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                row = (
+                    self._connection()
+                    .execute(
+                        "SELECT results FROM searches WHERE query = ? AND expires_at > ?",
+                        (cache_key(title, artist), time.time()),
+                    )
+                    .fetchone()
+                )
+        except sqlite3.Error as e:
+            # the cache is an optimization; fall back to searching
+            logger.warning(f"Search cache read failed: {e}")
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, title: str, artist: str, results: list, matched: bool) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.time() + (self.ttl if matched else self.negative_ttl)
+        try:
+            with self._lock:
+                self._connection().execute(
+                    "INSERT OR REPLACE INTO searches (query, results, matched, expires_at) VALUES (?, ?, ?, ?)",
+                    (cache_key(title, artist), json.dumps(results, default=str), int(matched), expires_at),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache write failed: {e}")
+
+    def purge(self, expired_only: bool = False) -> int:
+        """Delete cached searches (only expired ones if `expired_only`). Returns the count."""
+        with self._lock:
+            conn = self._connection()
+            if expired_only:
+                cursor = conn.execute("DELETE FROM searches WHERE expires_at <= ?", (time.time(),))
+            else:
+                cursor = conn.execute("DELETE FROM searches")
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "path": self.path, "hits": self.hits, "misses": self.misses}
+
+
+search_cache = SearchCache(SEARCH_CACHE_PATH, SEARCH_CACHE_TTL, SEARCH_CACHE_NEGATIVE_TTL)
@@ -0,0 +1,129 @@
+"""Spotify playlist helpers shared by the API and `scripts/sync_songs.py`.
+
+Playlists are read page by page: the first page gives the total, then the
+remaining offset pages are fetched concurrently (bounded) with a field filter
+so Spotify only sends what `track_to_song` needs. Pages are yielded as they
+arrive so callers can dedupe and insert while later pages are in flight.
+
+Deduplication against a song collection is done in batches: one `$in` query
+per batch of track ids instead of a `find_one` per track, and new songs are
+written with an unordered bulk upsert keyed on `spotify_id` so that re-syncs
+(or two syncs racing) never insert the same track twice.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from app.pagination import with_shuffle_key
+
+logger = logging.getLogger(__name__)
+
+PLAYLIST_PAGE_SIZE = 100  # Spotify's maximum for playlist items
+PLAYLIST_FIELDS = "total,items(track(id,name,artists(name),album(images(url))))"
+PLAYLIST_PAGE_CONCURRENCY = int(os.getenv("SPOTIFY_PAGE_CONCURRENCY", "4"))
+
+_indexed_collections: set[str] = set()
+
+
+def _page_tracks(page: dict) -> list[dict]:
+    return [item["track"] for item in page.get("items") or [] if item.get("track") and item["track"].get("id")]
+
+
+async def iter_playlist_tracks(
+    spotify_client, playlist_id: str, concurrency: int = PLAYLIST_PAGE_CONCURRENCY
+) -> AsyncIterator[tuple[int, list[dict]]]:
+    """Yield `(offset, tracks)` for every page of a playlist.
+
+    The first page comes first; the rest are yielded in completion order, so
+    callers that care about playlist order should sort by offset. Spotipy is
+    synchronous, so each page request runs in the default executor.
+    """
+    loop = asyncio.get_running_loop()
+
+    def fetch(offset: int) -> dict:
+        return spotify_client.playlist_items(
+            playlist_id, fields=PLAYLIST_FIELDS, limit=PLAYLIST_PAGE_SIZE, offset=offset, additional_types=("track",)
+        )
+
+    first = await loop.run_in_executor(None, fetch, 0)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def fetch_page(offset: int) -> tuple[int, list[dict]]:
+        async with slots:
+            return offset, _page_tracks(await loop.run_in_executor(None, fetch, offset))
+
+    # start the remaining pages before handing the first one to the caller
+    tasks = [
+        asyncio.create_task(fetch_page(offset))
+        for offset in range(PLAYLIST_PAGE_SIZE, first.get("total") or 0, PLAYLIST_PAGE_SIZE)
+    ]
+    try:
+        yield 0, _page_tracks(first)
+        for next_page in asyncio.as_completed(tasks):
+            yield await next_page
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def track_to_song(track: dict) -> dict:
+    """Build a song document from a Spotify playlist track object."""
+    return {
+        "title": track["name"],
+        # get the first artist
+        "artist": track["artists"][0]["name"],
+        # get the album cover image
+        "cover_image_url": track["album"]["images"][0]["url"] if track["album"]["images"] else None,
+        "spotify_id": track["id"],
+    }
+
+
+async def ensure_spotify_index(collection) -> None:
+    """Create the unique `spotify_id` index once per collection per process.
+
+    Songs added without a Spotify id are excluded by the partial filter. If
+    the collection already holds duplicates the index can't be built; that is
+    logged and the batched lookups still work, just without the guarantee.
+    """
+    if collection.full_name in _indexed_collections:
+        return
+    try:
+        await collection.create_index(
+            "spotify_id", unique=True, partialFilterExpression={"spotify_id": {"$type": "string"}}
+        )
+    except OperationFailure as e:
+        logger.warning(f"Could not create unique spotify_id index on {collection.full_name}: {e}")
+    _indexed_collections.add(collection.full_name)
+
+
+async def existing_spotify_ids(collection, spotify_ids: list[str]) -> set[str]:
+    """Return the subset of `spotify_ids` already present, in one query."""
+    if not spotify_ids:
+        return set()
+    cursor = collection.find({"spotify_id": {"$in": spotify_ids}}, {"spotify_id": 1, "_id": 0})
+    return {doc["spotify_id"] async for doc in cursor}
+
+
+async def upsert_songs(collection, songs: list[dict]) -> int:
+    """Insert songs whose `spotify_id` isn't in the collection yet.
+
+    Uses `$setOnInsert` upserts so existing songs are left untouched, and
+    `ordered=False` so one failure doesn't stop the rest of the batch.
+    Returns the number of songs inserted.
+    """
+    if not songs:
+        return 0
+    await ensure_spotify_index(collection)
+    result = await collection.bulk_write(
+        [
+            UpdateOne({"spotify_id": song["spotify_id"]}, {"$setOnInsert": with_shuffle_key(song)}, upsert=True)
+            for song in songs
+        ],
+        ordered=False,
+    )
+    return result.upserted_count
@@ -0,0 +1,332 @@
+"""In-process load benchmark for the hot API routes.
+
+Usage:
+    cd backend
+    python scripts/bench_api.py [--songs 10,1000,10000] [--concurrency 16] [--requests 200]
+    python scripts/bench_api.py --save bench-baseline.json
+    python scripts/bench_api.py --compare bench-baseline.json [--tolerance 0.2]
+
+The ASGI `app` is driven directly (no HTTP server or socket in between), so
+the numbers measure the route handlers, Motor and Mongo. The script needs a
+local `mongod`; it seeds a throwaway database (MONGODB_DB, default
+`portfolio_bench`, dropped first) with:
+
+  * one song collection per `--songs` size (`bench_10`, `bench_1000`, ...),
+    all pointing at a few shared `--audio-mb` MB GridFS audio blobs;
+  * projects, experiences, contact info and a 1 MB resume PDF.
+
+Each scenario sends `--requests` GETs with `--concurrency` in flight and
+reports throughput and p50/p95/p99 latency. `--save` writes the results as a
+JSON baseline; `--compare` checks a run against one and exits 1 if any
+scenario's p95 rose, or its throughput fell, by more than `--tolerance`.
+Compare runs made on the same machine with the same arguments.
+
+Required env vars:
+    MONGODB_URL     local Mongo to benchmark against (default mongodb://localhost:27017)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Make `import app.main` work regardless of where the script is invoked from.
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_ROOT))
+
+DEFAULT_DB = "portfolio_bench"
+
+Request = tuple[str, str, list[tuple[str, str]]]  # path, query string, headers
+
+
+async def asgi_get(app, path: str, query: str = "", headers: list[tuple[str, str]] | None = None) -> tuple[int, int]:
+    """Send one GET straight to the ASGI app; returns (status, body bytes)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench")] + [(k.lower().encode(), v.encode()) for k, v in headers or []],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+    status = 0
+    size = 0
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # the client never disconnects; the app stops listening once it responds
+        await asyncio.get_running_loop().create_future()
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))]
+
+
+async def run_scenario(app, make_request: Callable[[int], Request], requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    total_bytes = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, total_bytes, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            path, query, headers = make_request(index)
+            start = time.perf_counter()
+            status, size = await asgi_get(app, path, query, headers)
+            latencies.append(time.perf_counter() - start)
+            total_bytes += size
+            if status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "mb_per_s": round(total_bytes / elapsed / 1e6, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def seed(api, sizes: list[int], audio_mb: float, audio_files: int) -> dict[str, list[str]]:
+    """Fill the bench database; returns {collection name: song ids}."""
+    from app.pagination import new_shuffle_key
+
+    await api.client.drop_database(api.db.name)
+
+    blob = os.urandom(int(audio_mb * 1024 * 1024))
+    audio_ids = [
+        str(await api.fs.upload_from_stream(f"bench-{i}.mp3", io.BytesIO(blob), metadata={"contentType": "audio/mp3"}))
+        for i in range(audio_files)
+    ]
+
+    catalogs = {}
+    for size in sizes:
+        name = f"bench_{size}"
+        songs = [
+            {
+                "title": f"Song {i}",
+                "artist": f"Artist {i % 500}",
+                "cover_image_url": f"https://example.com/covers/{i}.jpg",
+                "audio_file_id": audio_ids[i % audio_files],
+                "spotify_id": f"bench{size}-{i}",
+                "shuffle_key": new_shuffle_key(),
+            }
+            for i in range(size)
+        ]
+        for start in range(0, size, 1000):
+            await api.db[name].insert_many(songs[start : start + 1000])
+        catalogs[name] = [str(song["_id"]) for song in songs]
+
+    await api.db.projects.insert_many(
+        [
+            {
+                "name": f"Project {i}",
+                "description": "A benchmark project " * 5,
+                "technologies": ["Python", "FastAPI", "MongoDB"],
+                "year": 2015 + i % 10,
+                "level": i % 4,
+                "github": f"https://github.com/example/project-{i}",
+            }
+            for i in range(25)
+        ]
+    )
+    await api.db.experiences.insert_many(
+        [
+            {
+                "title": f"Engineer {i}",
+                "company": f"Company {i}",
+                "location": "Remote",
+                "start_date": f"Jan {2010 + i}",
+                "end_date": "Present" if i == 0 else f"Dec {2011 + i}",
+                "description": ["Built things", "Measured things"],
+            }
+            for i in range(12)
+        ]
+    )
+    await api.db.contact.insert_one(
+        {"_id": "primary", "email": "me@example.com", "phone": "555-0100", "linkedin": "x", "github": "y"}
+    )
+    resume_id = await api.fs.upload_from_stream(
+        "resume.pdf", io.BytesIO(os.urandom(1024 * 1024)), metadata={"contentType": "application/pdf"}
+    )
+    await api.db.resume.insert_one(
+        {
+            "filename": "resume.pdf",
+            "file_id": str(resume_id),
+            "upload_date": datetime.now(UTC),
+            "content_type": "application/pdf",
+        }
+    )
+    return catalogs
+
+
+def scenarios(catalogs: dict[str, list[str]], rng: random.Random) -> dict[str, Callable[[int], Request]]:
+    found: dict[str, Callable[[int], Request]] = {
+        "projects": lambda _: ("/projects", "", []),
+        "experiences": lambda _: ("/experiences", "", []),
+        "contact": lambda _: ("/contact", "", []),
+        "resume_meta": lambda _: ("/resume", "", []),
+        "resume_view": lambda _: ("/resume/view", "", []),
+    }
+    for name, ids in catalogs.items():
+
+        def song_audio(_, name=name, ids=ids):
+            return f"/songs/{name}/{rng.choice(ids)}/audio", "", []
+
+        def song_audio_range(_, name=name, ids=ids):
+            return f"/songs/{name}/{rng.choice(ids)}/audio", "", [("range", "bytes=0-262143")]
+
+        found[f"{name}/songs_page"] = lambda _, name=name: (f"/songs/{name}", "limit=50", [])
+        found[f"{name}/songs_seeded_page"] = lambda _, name=name: (f"/songs/{name}", "limit=50&seed=42", [])
+        found[f"{name}/songs_full_list"] = lambda _, name=name: (f"/songs/{name}", "", [])
+        found[f"{name}/bootstrap"] = lambda _, name=name: ("/bootstrap", f"collection={name}", [])
+        found[f"{name}/song_audio"] = song_audio
+        found[f"{name}/song_audio_range"] = song_audio_range
+    return found
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0
+        rps_change = result["rps"] / before["rps"] - 1 if before["rps"] else 0
+        flag = ""
+        if p95_change > tolerance or rps_change < -tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:40} p95 {p95_change:+7.1%}   rps {rps_change:+7.1%}{flag}")
+    return regressions
+
+
+async def bench(args) -> dict:
+    # app.main reads its configuration at import time
+    from app import main as api
+
+    rng = random.Random(args.seed)
+    print(f"Seeding {api.MONGODB_DB} ({', '.join(map(str, args.songs))} songs, {args.audio_mb:g} MB audio)...")
+    catalogs = await seed(api, args.songs, args.audio_mb, args.audio_files)
+
+    all_scenarios = scenarios(catalogs, rng)
+    selected = {
+        name: make
+        for name, make in all_scenarios.items()
+        if not args.scenarios or any(part in name for part in args.scenarios)
+    }
+
+    results = {}
+    async with api.app.router.lifespan_context(api.app):
+        for name, make_request in selected.items():
+            # one untimed pass warms caches and connection pools
+            await run_scenario(api.app, make_request, min(args.concurrency, args.requests), args.concurrency)
+            results[name] = await run_scenario(api.app, make_request, args.requests, args.concurrency)
+            r = results[name]
+            print(
+                f"  {name:40} {r['rps']:>9.1f} req/s  p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}"
+                f"  p99 {r['p99_ms']:>8.2f} ms  {r['mb_per_s']:>8.2f} MB/s  errors {r['errors']}"
+            )
+    await api.client.drop_database(api.db.name)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the API routes in-process against a local mongod.")
+    parser.add_argument(
+        "--songs",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[10, 1000, 10000],
+        help="Comma-separated catalog sizes to seed (default: 10,1000,10000)",
+    )
+    parser.add_argument("--audio-mb", type=float, default=4, help="Size of each seeded audio blob in MB")
+    parser.add_argument("--audio-files", type=int, default=3, help="Distinct audio blobs shared by the songs")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario")
+    parser.add_argument("--scenarios", nargs="*", help="Only run scenarios whose name contains one of these")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for song selection")
+    parser.add_argument("--db", default=os.getenv("MONGODB_DB", DEFAULT_DB), help="Database to seed (dropped first)")
+    parser.add_argument(
+        "--audio-cache", action="store_true", help="Keep the local disk audio cache on (off by default)"
+    )
+    parser.add_argument("--save", type=Path, help="Write the results to this JSON baseline file")
+    parser.add_argument("--compare", type=Path, help="Compare against a JSON baseline from --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95/throughput change (default 0.2)")
+    args = parser.parse_args()
+
+    if args.db == "portfolio":
+        print("ERROR: refusing to seed (and drop) the `portfolio` database; pick another --db", file=sys.stderr)
+        return 1
+    os.environ["MONGODB_DB"] = args.db
+    os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+    if not args.audio_cache:
+        os.environ["AUDIO_CACHE_MAX_BYTES"] = "0"
+
+    results = asyncio.run(bench(args))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "songs": args.songs,
+            "audio_mb": args.audio_mb,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        print(f"\nCompared with {args.compare} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print(f"\nFAIL: {len(regressions)} scenario(s) regressed")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
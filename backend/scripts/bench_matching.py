@@ -0,0 +1,119 @@
+"""Measure YouTube match quality and speed against a labelled corpus.
+
+Usage:
+    cd backend
+    python scripts/bench_matching.py [--corpus scripts/match_corpus.json] [--repeat 200] [--json]
+
+Each corpus case is a Spotify song (title, artist), the YouTube Music search
+results it came back with, and the `videoId` that should be picked (or null
+if none of them is the right recording). The script reports, for both the
+current matcher (`app.matching`) and the previous first-over-threshold
+`difflib` matcher, how many cases pick the expected result, which cases they
+get wrong, and matches per second when the whole corpus is re-matched
+`--repeat` times (roughly what re-matching a whole catalog costs).
+
+Add a case whenever a real song is matched wrongly, then re-run this.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Make `import app.matching` work regardless of where the script is invoked from.
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.matching import MATCH_THRESHOLD, normalize, pick_youtube_match  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "match_corpus.json"
+
+
+def _legacy_ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
+
+
+def legacy_pick_youtube_match(title: str, artist: str, results: list, threshold: float = MATCH_THRESHOLD):
+    """The matcher this repo used before `app.matching`, kept as a baseline."""
+    if not title or not artist or not results:
+        return None
+    for result in results:
+        result_title = result.get("title") or ""
+        result_artist = " ".join(a.get("name", "") for a in (result.get("artists") or []))
+        if not result_title or not result_artist:
+            continue
+        if _legacy_ratio(title, result_title) >= threshold and _legacy_ratio(artist, result_artist) >= threshold:
+            return result
+    return None
+
+
+MATCHERS = {
+    "current": pick_youtube_match,
+    "legacy": legacy_pick_youtube_match,
+}
+
+
+def evaluate(matcher, corpus: list[dict]) -> tuple[int, list[str]]:
+    correct = 0
+    wrong = []
+    for case in corpus:
+        match = matcher(case["title"], case["artist"], case["results"])
+        picked = match.get("videoId") if match else None
+        if picked == case["expected"]:
+            correct += 1
+        else:
+            wrong.append(f"{case['note']}: expected {case['expected']}, picked {picked}")
+    return correct, wrong
+
+
+def throughput(matcher, corpus: list[dict], repeat: int) -> float:
+    """Songs matched per second over `repeat` passes of the corpus."""
+    # start from a cold normalization cache so the first pass pays for it
+    normalize.cache_clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for case in corpus:
+            matcher(case["title"], case["artist"], case["results"])
+    elapsed = time.perf_counter() - start
+    return len(corpus) * repeat / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark YouTube search result matching.")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Labelled corpus JSON file")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the corpus for the speed test")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    corpus = json.loads(args.corpus.read_text(encoding="utf-8"))
+    report = {}
+    for name, matcher in MATCHERS.items():
+        correct, wrong = evaluate(matcher, corpus)
+        report[name] = {
+            "correct": correct,
+            "total": len(corpus),
+            "accuracy": correct / len(corpus),
+            "matches_per_second": round(throughput(matcher, corpus, args.repeat)),
+            "wrong": wrong,
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    for name, result in report.items():
+        print(
+            f"{name:8} accuracy {result['correct']}/{result['total']} ({result['accuracy']:.0%})"
+            f"  {result['matches_per_second']:>8} matches/s"
+        )
+        for line in result["wrong"]:
+            print(f"           - {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Compare the validated and FAST_JSON_RESPONSES serialization paths.
+
+Usage:
+    cd backend
+    python scripts/bench_serialization.py [--songs 1000,10000] [--repeat 20] [--json]
+
+For the song listing, /projects and /experiences this times, in-process and
+without Mongo, turning the documents a handler receives into response bytes:
+
+  * validated: `_strip_mongo_id` on full documents, then what the endpoint
+    does today - FastAPI's response_model validation and JSON encoding for
+    songs, the cached-body TypeAdapter for projects and experiences;
+  * fast: `app.fast_json.dump_documents` on projected documents (what Mongo
+    returns with `model_projection`).
+
+It also validates every fast body against the response model and checks it
+decodes to the same data as the validated one, so this doubles as the schema
+check the fast path skips at request time; it exits 1 on a mismatch.
+Projection also saves Mongo and network time, which this doesn't measure
+(see scripts/bench_api.py with FAST_JSON_RESPONSES=true for end to end).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bson import ObjectId
+
+# Make `import app.main` work regardless of where the script is invoked from.
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_ROOT))
+
+
+def make_songs(count: int) -> list[dict]:
+    from app.pagination import new_shuffle_key
+
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Song {i}",
+            "artist": f"Artist {i % 500}",
+            "cover_image_url": f"https://i.scdn.co/image/ab67616d0000b273{i:032x}",
+            "audio_file_id": str(ObjectId()),
+            # older songs predate variants; the fast path must fill in null
+            **({"audio_variants": {"opus96": str(ObjectId()), "opus64": str(ObjectId())}} if i % 2 else {}),
+            "spotify_id": f"bench-{i}",
+            "youtube_link": f"https://youtube.com/watch?v={i:011d}",
+            "shuffle_key": new_shuffle_key(),
+        }
+        for i in range(count)
+    ]
+
+
+def make_projects(count: int) -> list[dict]:
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Project {i}",
+            "description": "A benchmark project " * 5,
+            "technologies": ["Python", "FastAPI", "MongoDB"],
+            "year": 2015 + i % 10,
+            "level": i % 4,
+            "github": f"https://github.com/example/project-{i}",
+            "sort_level": i % 4,
+        }
+        for i in range(count)
+    ]
+
+
+def make_experiences(count: int) -> list[dict]:
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Engineer {i}",
+            "company": f"Company {i}",
+            "location": "Remote",
+            "start_date": f"Jan {2010 + i}",
+            "end_date": "Present" if i == 0 else f"Dec {2011 + i}",
+            "description": ["Built things", "Measured things"],
+            "sort_end": 999912,
+            "sort_start": 201001 + i * 100,
+        }
+        for i in range(count)
+    ]
+
+
+def project(documents: list[dict], projection: dict[str, int]) -> list[dict]:
+    """What Mongo returns for `find({}, projection)`."""
+    return [{"_id": doc["_id"], **{key: doc[key] for key in projection if key in doc}} for doc in documents]
+
+
+def fastapi_serializer(path: str) -> Callable[[list[dict]], bytes]:
+    """The response_model validation and encoding FastAPI applies to a handler's return value."""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    import app.main as api
+
+    route = next(r for r in api.app.routes if getattr(r, "path", None) == path and "GET" in r.methods)
+
+    def serialize(items: list[dict]) -> bytes:
+        content = asyncio.run(serialize_response(field=route.response_field, response_content=items))
+        return JSONResponse(content).body
+
+    return serialize
+
+
+def adapter_serializer(adapter) -> Callable[[list[dict]], bytes]:
+    return lambda items: adapter.dump_json(adapter.validate_python(items))
+
+
+def serialize_validated(serialize: Callable[[list[dict]], bytes], documents: list[dict]) -> bytes:
+    from app.main import _strip_mongo_id
+
+    # handlers get fresh documents from Mongo each time, and _strip_mongo_id mutates them
+    return serialize([_strip_mongo_id(dict(doc)) for doc in documents])
+
+
+def timed(repeat: int, fn: Callable[..., bytes], *args) -> tuple[float, bytes]:
+    body = fn(*args)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn(*args)
+    return (time.perf_counter() - start) / repeat, body
+
+
+def check(fast_body: bytes, validated_body: bytes, adapter) -> str | None:
+    try:
+        adapter.validate_json(fast_body)
+    except Exception as e:
+        return f"fast body fails the response model: {e}"
+    if json.loads(fast_body) != json.loads(validated_body):
+        return "fast body differs from the validated body"
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark validated vs fast list serialization.")
+    parser.add_argument("--songs", default="1000,10000", help="Comma-separated song collection sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed serializations per case")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    import app.main as api
+    from app.fast_json import dump_documents
+
+    cases = [
+        (
+            f"songs[{size}]",
+            make_songs(size),
+            fastapi_serializer("/songs/{collection_name}"),
+            api._SONG_PROJECTION,
+            api._SONG_DEFAULTS,
+            api.TypeAdapter(list[api.SongResponse]),
+        )
+        for size in (int(value) for value in args.songs.split(","))
+    ]
+    cases += [
+        (
+            "projects[25]",
+            make_projects(25),
+            adapter_serializer(api._PROJECTS_JSON),
+            api._PROJECT_PROJECTION,
+            api._PROJECT_DEFAULTS,
+            api._PROJECTS_JSON,
+        ),
+        (
+            "experiences[12]",
+            make_experiences(12),
+            adapter_serializer(api._EXPERIENCES_JSON),
+            api._EXPERIENCE_PROJECTION,
+            api._EXPERIENCE_DEFAULTS,
+            api._EXPERIENCES_JSON,
+        ),
+    ]
+
+    report = {}
+    failed = False
+    for name, documents, serialize, projection, defaults, adapter in cases:
+        validated_s, validated_body = timed(args.repeat, serialize_validated, serialize, documents)
+        fast_s, fast_body = timed(args.repeat, dump_documents, project(documents, projection), defaults)
+        error = check(fast_body, validated_body, adapter)
+        failed = failed or error is not None
+        report[name] = {
+            "validated_ms": round(validated_s * 1000, 3),
+            "fast_ms": round(fast_s * 1000, 3),
+            "speedup": round(validated_s / fast_s, 1),
+            "validated_per_s": round(1 / validated_s, 1),
+            "fast_per_s": round(1 / fast_s, 1),
+            "validated_bytes": len(validated_body),
+            "fast_bytes": len(fast_body),
+            "error": error,
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 1 if failed else 0
+
+    for name, result in report.items():
+        print(
+            f"{name:16} validated {result['validated_ms']:>9.3f} ms  fast {result['fast_ms']:>8.3f} ms"
+            f"  {result['speedup']:>5}x  ({result['validated_per_s']} -> {result['fast_per_s']} responses/s)"
+        )
+        if result["error"]:
+            print(f"                 ! {result['error']}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
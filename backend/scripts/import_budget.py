@@ -0,0 +1,125 @@
+"""Measure how long `import app.main` takes and enforce a budget on it.
+
+Usage:
+    cd backend
+    python scripts/import_budget.py [--runs 5] [--budget-ms 1000] [--top 15] [--json]
+
+Every uvicorn worker (and every Railway cold start) imports `app.main` before
+it can answer `/health`, so import time is startup time. This script:
+
+  * times `import app.main` in fresh interpreters (`--runs` of them) and
+    compares the median against `--budget-ms`;
+  * runs one more import under `python -X importtime` and prints the
+    slowest top-level imports, to show where the time goes;
+  * checks that the heavy client libraries only the admin/ingest routes use
+    (yt-dlp, spotipy, googleapiclient, ytmusicapi) are not imported at all.
+
+Exits 1 if the budget is exceeded or a deferred module was imported, so it
+can gate a deploy. Budgets are machine-dependent; pick one with headroom
+over what your deploy target measures.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+# Imported lazily by the routes that need them; must never load with app.main.
+DEFERRED_MODULES = ("yt_dlp", "spotipy", "googleapiclient", "ytmusicapi")
+
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+
+_TIMED_IMPORT = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_ROOT, env=env, capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"`import app.main` failed:\n{result.stderr}")
+    return result
+
+
+def time_import(runs: int) -> list[float]:
+    """Wall time of `import app.main` in ms, once per fresh interpreter."""
+    return [float(_run(["-c", _TIMED_IMPORT]).stdout.strip()) * 1000 for _ in range(runs)]
+
+
+def import_profile() -> list[tuple[str, int, int]]:
+    """`(module, self_us, cumulative_us)` for every import, from -X importtime."""
+    stderr = _run(["-X", "importtime", "-c", "import app.main"]).stderr
+    profile = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        # drop the space after "|"; what's left is indented two spaces per level
+        profile.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return profile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure and enforce the import-time budget of app.main.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time (median is used)")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Maximum median import time (default: IMPORT_BUDGET_MS or {DEFAULT_BUDGET_MS:g})",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    timings = time_import(args.runs)
+    median_ms = statistics.median(timings)
+    profile = import_profile()
+
+    imported = {name.strip().split(".")[0] for name, _, _ in profile}
+    deferred_loaded = [module for module in DEFERRED_MODULES if module in imported]
+
+    # direct children of `import app.main` are indented by exactly two spaces
+    app_main_index = next(i for i, (name, _, _) in enumerate(profile) if name.strip() == "app.main")
+    top_level = [
+        (name.strip(), cumulative_us)
+        for name, _, cumulative_us in profile[:app_main_index]
+        if name.startswith("  ") and not name.startswith("   ")
+    ]
+    top_level.sort(key=lambda entry: -entry[1])
+
+    over_budget = median_ms > args.budget_ms
+    report = {
+        "median_ms": round(median_ms, 1),
+        "runs_ms": [round(ms, 1) for ms in timings],
+        "budget_ms": args.budget_ms,
+        "over_budget": over_budget,
+        "deferred_modules_imported": deferred_loaded,
+        "slowest_imports_ms": {name: round(us / 1000, 1) for name, us in top_level[: args.top]},
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import app.main: median {median_ms:.0f} ms over {args.runs} runs (budget {args.budget_ms:g} ms)")
+        print("\nSlowest imports under app.main (cumulative, one -X importtime run):")
+        for name, ms in report["slowest_imports_ms"].items():
+            print(f"  {ms:>8.1f} ms  {name}")
+        if deferred_loaded:
+            print(f"\nFAIL: deferred modules imported at startup: {', '.join(deferred_loaded)}")
+        if over_budget:
+            print(f"\nFAIL: median import time {median_ms:.0f} ms exceeds budget {args.budget_ms:g} ms")
+
+    return 1 if over_budget or deferred_loaded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
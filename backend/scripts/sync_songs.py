@@ -10,6 +10,12 @@ Usage:
     python scripts/sync_songs.py --override "Who Knows" "https://youtu.be/abc"
     python scripts/sync_songs.py --override "Who Knows" "https://..." --override "Other" "https://..."
 
+    # YouTube Music searches are cached across runs (see app/search_cache.py),
+    # so a rerun after failures only searches for new songs. To ignore the
+    # cache for one run, or to clear it first:
+    python scripts/sync_songs.py --no-search-cache
+    python scripts/sync_songs.py --purge-search-cache
+
 This script talks directly to Spotify, YouTube Music, yt-dlp, and Mongo.
 The backend does NOT need to be running. It uses the same env vars and the
 same Python venv as the backend, so there is nothing extra to install or
@@ -21,18 +27,22 @@ Required env vars (from backend/.env):
     SPOTIFY_CLIENT_SECRET
     SPOTIFY_PLAYLIST_ID  the Spotify playlist to mirror
 
+Optional:
+    MONGODB_DB           database name (default: portfolio)
+
 External requirement:
-    ffmpeg               must be on PATH (yt-dlp uses it for MP3 extraction)
+    ffmpeg               must be on PATH (yt-dlp uses it for MP3 extraction, and
+                         it transcodes the lower-bitrate Opus variants)
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
-import io
 import os
 import re
 import sys
+import tempfile
 from pathlib import Path
 
 # Make `import app.audio` work regardless of where the script is invoked from.
@@ -46,7 +56,11 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket  #
 from spotipy.oauth2 import SpotifyClientCredentials  # noqa: E402
 from ytmusicapi import YTMusic  # noqa: E402
 
-from app.audio import download_audio_sync, pick_youtube_match  # noqa: E402
+from app.audio import download_audio_file  # noqa: E402
+from app.ingest import song_audio_file_ids, store_audio  # noqa: E402
+from app.matching import MATCH_THRESHOLD, pick_youtube_match  # noqa: E402
+from app.search_cache import search_cache  # noqa: E402
+from app.spotify import existing_spotify_ids, iter_playlist_tracks, track_to_song, upsert_songs  # noqa: E402
 
 DEFAULT_COLLECTION = "study"
 
@@ -75,23 +89,43 @@ async def _apply_overrides(collection, fs, overrides: list[list[str]]) -> int:
             return 1
 
         song = matches[0]
-        old_audio = song.get("audio_file_id")
-        if old_audio:
+        for old_file_id in song_audio_file_ids(song):
             try:
-                await fs.delete(ObjectId(old_audio))
+                await fs.delete(ObjectId(old_file_id))
             except Exception as e:
                 print(f"  warning: failed to delete old audio for {song['title']}: {e}")
 
         await collection.update_one(
             {"_id": song["_id"]},
-            {"$set": {"youtube_link": url}, "$unset": {"audio_file_id": ""}},
+            {
+                "$set": {"youtube_link": url},
+                "$unset": {"audio_file_id": "", "audio_variants": "", "audio_segments": ""},
+            },
         )
         print(f"  override pinned: {song['title']} -> {url}")
 
     return 0
 
 
-async def sync(collection_name: str, overrides: list[list[str]] | None) -> int:
+def _search_and_match(ytmusic, title: str, artist: str, use_search_cache: bool) -> tuple[list, dict | None]:
+    """Search YouTube Music for a song (or reuse a cached search) and pick the
+    best match. Searches are cached whether or not they matched."""
+    search_results = search_cache.get(title, artist) if use_search_cache else None
+    if search_results is not None:
+        return search_results, pick_youtube_match(title, artist, search_results)
+    search_results = ytmusic.search(f"{title} {artist}", filter="songs") or []
+    match = pick_youtube_match(title, artist, search_results)
+    if use_search_cache:
+        search_cache.put(title, artist, search_results, match is not None)
+    return search_results, match
+
+
+async def sync(
+    collection_name: str,
+    overrides: list[list[str]] | None,
+    use_search_cache: bool = True,
+    purge_search_cache: bool = False,
+) -> int:
     load_dotenv(BACKEND_ROOT / ".env")
 
     mongo_url = os.getenv("MONGODB_URL")
@@ -116,7 +150,7 @@ async def sync(collection_name: str, overrides: list[list[str]] | None) -> int:
 
     print("Connecting to Mongo...")
     mongo_client = AsyncIOMotorClient(mongo_url)
-    db = mongo_client.portfolio
+    db = mongo_client[os.getenv("MONGODB_DB", "portfolio")]
     collection = db[collection_name]
     fs = AsyncIOMotorGridFSBucket(db)
 
@@ -136,39 +170,23 @@ async def sync(collection_name: str, overrides: list[list[str]] | None) -> int:
             client_secret=spotify_client_secret,
         )
     )
+    # Pages after the first are fetched concurrently and deduped/upserted as
+    # they arrive: one $in query per page instead of a find_one per track,
+    # then an idempotent bulk upsert so a re-sync (or a concurrent one) can't
+    # insert the same spotify_id twice.
+    inserted = 0
+    skipped_existing = 0
     try:
-        results = spotify.playlist_tracks(playlist_id)
+        async for _offset, tracks in iter_playlist_tracks(spotify, playlist_id):
+            existing = await existing_spotify_ids(collection, [track["id"] for track in tracks])
+            new_docs = [track_to_song(track) for track in tracks if track["id"] not in existing]
+            skipped_existing += len(tracks) - len(new_docs)
+            inserted += await upsert_songs(collection, new_docs)
     except Exception as e:
         print(f"ERROR: Spotify fetch failed: {e}", file=sys.stderr)
         mongo_client.close()
         return 2
 
-    new_docs: list[dict] = []
-    skipped_existing = 0
-    for item in results.get("items", []):
-        track = item.get("track")
-        if not track:
-            continue
-        sid = track.get("id")
-        if not sid:
-            continue
-        if await collection.find_one({"spotify_id": sid}):
-            skipped_existing += 1
-            continue
-        new_docs.append(
-            {
-                "title": track["name"],
-                "artist": track["artists"][0]["name"],
-                "cover_image_url": (track["album"]["images"][0]["url"] if track["album"]["images"] else None),
-                "spotify_id": sid,
-            }
-        )
-
-    inserted = 0
-    if new_docs:
-        insert_result = await collection.insert_many(new_docs)
-        inserted = len(insert_result.inserted_ids)
-
     print(f"  inserted        : {inserted}")
     print(f"  skipped (exists): {skipped_existing}")
 
@@ -177,6 +195,8 @@ async def sync(collection_name: str, overrides: list[list[str]] | None) -> int:
     # If the song already has a `youtube_link` (manually pinned), use that
     # directly and skip the YouTube Music search.
     print("\nFinding songs missing audio...")
+    if purge_search_cache:
+        print(f"  purged {search_cache.purge()} cached search(es)")
     ytmusic = YTMusic()
     audio_processed = 0
     failed: list[tuple[str, str]] = []
@@ -185,10 +205,7 @@ async def sync(collection_name: str, overrides: list[list[str]] | None) -> int:
     # Snapshot the IDs to process up front, then re-fetch each song fresh.
     # Iterating an open cursor while update_one mutates the same docs is a
     # known footgun (Motor can revisit batched docs). Decoupling fixes it.
-    ids_to_process = [
-        s["_id"]
-        async for s in collection.find({"audio_file_id": {"$exists": False}}, {"_id": 1})
-    ]
+    ids_to_process = [s["_id"] async for s in collection.find({"audio_file_id": {"$exists": False}}, {"_id": 1})]
     print(f"  {len(ids_to_process)} song(s) to process")
 
     for song_id in ids_to_process:
@@ -207,33 +224,34 @@ async def sync(collection_name: str, overrides: list[list[str]] | None) -> int:
                 youtube_url = preset_link
                 print(f"     using pinned link: {youtube_url}")
             else:
-                search_results = ytmusic.search(f"{title} {artist}", filter="songs")
+                search_results, match = _search_and_match(ytmusic, title, artist, use_search_cache)
                 if not search_results:
                     failed.append((label, "No YouTube results"))
                     continue
 
-                match = pick_youtube_match(title, artist, search_results)
                 if not match:
                     top = search_results[0]
                     top_title = top.get("title") or "?"
                     top_artist = " ".join(a.get("name", "") for a in (top.get("artists") or [])) or "?"
-                    failed.append((label, f"No title+artist match >=0.7 (top: {top_title!r} by {top_artist!r})"))
+                    failed.append(
+                        (label, f"No title+artist match >={MATCH_THRESHOLD} (top: {top_title!r} by {top_artist!r})")
+                    )
                     continue
 
                 youtube_url = f"https://www.youtube.com/watch?v={match['videoId']}"
                 matched_artist = " ".join(a.get("name", "") for a in (match.get("artists") or []))
                 print(f"     matched: {match.get('title', '?')} by {matched_artist}")
 
-            audio_data = await loop.run_in_executor(None, download_audio_sync, youtube_url)
-
-            grid_in = await fs.upload_from_stream(
-                f"{title}.mp3",
-                io.BytesIO(audio_data),
-                metadata={"contentType": "audio/mp3"},
-            )
+            # Stream the download from its temp file straight into GridFS
+            # instead of reading the whole MP3 into memory first, then store
+            # the lower-bitrate renditions (and HLS segments, if
+            # INGEST_AUDIO_SEGMENTS is set) from the same file.
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = await loop.run_in_executor(None, download_audio_file, youtube_url, temp_dir)
+                fields = await store_audio(fs, title, path)
             await collection.update_one(
                 {"_id": song["_id"]},
-                {"$set": {"youtube_link": youtube_url, "audio_file_id": str(grid_in)}},
+                {"$set": {"youtube_link": youtube_url, **fields}},
             )
             audio_processed += 1
         except Exception as e:
@@ -241,6 +259,8 @@ async def sync(collection_name: str, overrides: list[list[str]] | None) -> int:
 
     print(f"\n  audio downloaded: {audio_processed}")
     print(f"  failed          : {len(failed)}")
+    if use_search_cache:
+        print(f"  cached searches : {search_cache.hits} reused, {search_cache.misses} new")
     if failed:
         print("\nFailures:")
         for label, reason in failed:
@@ -270,8 +290,18 @@ def main() -> int:
             "re-downloads from the given URL. Repeatable."
         ),
     )
+    parser.add_argument(
+        "--no-search-cache",
+        action="store_true",
+        help="Search YouTube Music for every song, ignoring and not updating the search cache",
+    )
+    parser.add_argument(
+        "--purge-search-cache",
+        action="store_true",
+        help="Delete all cached YouTube Music searches before processing songs",
+    )
     args = parser.parse_args()
-    return asyncio.run(sync(args.collection, args.override))
+    return asyncio.run(sync(args.collection, args.override, not args.no_search_cache, args.purge_search_cache))
 
 
 if __name__ == "__main__":